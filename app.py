@@ -1,14 +1,22 @@
 import streamlit as st
 from src.pipeline.prediction import Predict
-import pandas as pd
+from src.pipeline.engine import get_engine
+from src.logger import configure_logging
 
-# Initialize the Prediction class
-predictor = Predict()
-USERS_PATH = 'artifact/users.csv'
+configure_logging()
+
+@st.cache_resource
+def get_predictor():
+    # Load and warm up the shared engine once per process, not on every rerun
+    engine = get_engine()
+    engine.warm_up()
+    return Predict(engine)
+
+predictor = get_predictor()
 
 def load_users():
     try:
-        users = pd.read_csv(USERS_PATH)
+        users = predictor.engine.predictor.users
         return users
     except Exception as e:
         st.error(f"Failed to load user data: {e}")
@@ -1,12 +1,19 @@
 import argparse
-from src.pipeline.data_pusher import data_pipeline
-from src.pipeline.training import Train
-from src.pipeline.prediction import Predict
-from src.logger import logger
+from src.config.prediction import PredictionInput
+from src.config.service import ServiceConfig
+from src.config.benchmark import BenchmarkConfig
+from src.config.data_generator import DataGeneratorConfig
+from src.config.manifest import TRAINING_STAGES
+from src.logger import logger, configure_logging
 from src.exception import CustomException
 import sys
 
+# Pipelines are imported inside the branch that runs them, so every command
+# only loads the libraries it needs (e.g. prediction never imports pymongo)
+
 def main():
+    configure_logging()
+
     # Create the parser
     parser = argparse.ArgumentParser(description="Data Ingestion and Training Pipeline")
 
@@ -17,6 +24,25 @@ def main():
         help="Flag to run the data pipeline"
     )
 
+    parser.add_argument(
+        '--push-mode', 
+        choices=['upsert', 'replace'], 
+        default='upsert', 
+        help="How the data pipeline writes to MongoDB: bulk upsert of changed documents or delete-all-then-insert"
+    )
+
+    # Add arguments for synthetic data generation
+    parser.add_argument(
+        '--generate-data', 
+        action='store_true', 
+        help="Flag to write a synthetic load-testing dataset to --output-dir"
+    )
+
+    parser.add_argument('--num-users', type=int, default=DataGeneratorConfig.num_users, help="Synthetic users to generate")
+    parser.add_argument('--num-courses', type=int, default=DataGeneratorConfig.num_courses, help="Synthetic courses to generate")
+    parser.add_argument('--num-ratings', type=int, default=DataGeneratorConfig.num_ratings, help="Synthetic unique ratings to generate")
+    parser.add_argument('--output-dir', default=DataGeneratorConfig.output_dirpath, help="Directory for the synthetic dataset")
+
     # Add arguments for training pipeline
     parser.add_argument(
         '--run-training', 
@@ -24,6 +50,32 @@ def main():
         help="Flag to run the training pipeline"
     )
     
+    parser.add_argument(
+        '--incremental', 
+        action='store_true', 
+        help="Update training artifacts incrementally instead of rebuilding them"
+    )
+
+    parser.add_argument(
+        '--full-refresh', 
+        action='store_true', 
+        help="Re-download every MongoDB collection instead of only new documents"
+    )
+
+    parser.add_argument(
+        '--force', 
+        action='store_true', 
+        help="Re-run every training stage even if its inputs are unchanged"
+    )
+
+    parser.add_argument(
+        '--force-stage', 
+        action='append', 
+        default=[], 
+        choices=TRAINING_STAGES, 
+        help="Re-run this training stage even if its inputs are unchanged; may be repeated"
+    )
+
     # Add arguments for prediction pipeline
     parser.add_argument(
         '--run-prediction', 
@@ -39,19 +91,108 @@ def main():
         required='--run-prediction' in sys.argv  # Make this argument required if --run-prediction is used
     )
     
+    # Add arguments for batch prediction pipeline
+    parser.add_argument(
+        '--run-batch-prediction', 
+        action='store_true', 
+        help="Flag to generate recommendations for every user into a Parquet file"
+    )
+
+    parser.add_argument(
+        '--top-n', 
+        type=int, 
+        default=10, 
+        help="Number of courses to recommend per user in batch prediction"
+    )
+    
+    parser.add_argument(
+        '--low-memory', 
+        action='store_true', 
+        help="Serve predictions from float32 artifacts and downcast tables to reduce per-worker memory"
+    )
+
+    # Add arguments for the HTTP recommendation service
+    parser.add_argument(
+        '--serve', 
+        action='store_true', 
+        help="Flag to run the asyncio HTTP recommendation service"
+    )
+
+    parser.add_argument('--host', default=ServiceConfig.host, help="Host the service binds to")
+    parser.add_argument('--port', type=int, default=ServiceConfig.port, help="Port the service listens on")
+
+    # Add arguments for instrumentation
+    parser.add_argument(
+        '--metrics-file', 
+        help="Write stage timings, latency quantiles and artifact sizes to this Prometheus text file"
+    )
+
+    parser.add_argument(
+        '--profile', 
+        action='store_true', 
+        help="Dump a cProfile of every prediction request to the profile directory"
+    )
+
+    # Add arguments for benchmark suite
+    parser.add_argument(
+        '--run-benchmark', 
+        action='store_true', 
+        help="Flag to benchmark training and prediction stages on synthetic datasets"
+    )
+
+    parser.add_argument(
+        '--benchmark-sizes', 
+        nargs='+', 
+        choices=list(BenchmarkConfig().sizes), 
+        help="Dataset sizes to benchmark; all sizes when omitted"
+    )
+
+    parser.add_argument(
+        '--benchmark-baseline', 
+        help="Earlier benchmark report to check for regressions against"
+    )
+
+    parser.add_argument(
+        '--check-import-budget', 
+        action='store_true', 
+        help="Time the imports of every command in a fresh interpreter and fail if one is over budget"
+    )
+    
     # Parse the arguments
     args = parser.parse_args()
 
     try:
+        if args.low_memory:
+            from src.pipeline.engine import get_engine
+            get_engine(PredictionInput(low_memory=True))
+
         if args.run_data_pipeline:
             logger.info("Initiating data pipeline")
-            data_pipeline()
+            from src.pipeline.data_pusher import data_pipeline
+            data_pipeline(mode=args.push_mode)
             logger.info("Successfully completed data pipeline")
 
+        if args.generate_data:
+            logger.info("Initiating synthetic data generation")
+            from src.components.data_generator import DataGenerator
+            config = DataGeneratorConfig(
+                output_dirpath=args.output_dir,
+                num_users=args.num_users,
+                num_courses=args.num_courses,
+                num_ratings=args.num_ratings
+            )
+            output_dirpath = DataGenerator(config).initiate_data_generation()
+            print(f"Synthetic data written to {output_dirpath}")
+            logger.info("Successfully completed synthetic data generation")
+
         if args.run_training:
             logger.info("Initiating training pipeline")
+            from src.pipeline.training import Train
             trainer = Train()
-            trainer.initiate_training()
+            force_stages = ['all'] if args.force else args.force_stage
+            trainer.initiate_training(
+                incremental=args.incremental, full_refresh=args.full_refresh, force_stages=force_stages
+            )
             logger.info("Successfully completed training pipeline")
         
         if args.run_prediction:
@@ -59,10 +200,52 @@ def main():
                 raise ValueError("User ID must be provided for the prediction pipeline")
                 
             logger.info("Initiating prediction pipeline")
-            pred = Predict()
+            from src.pipeline.prediction import Predict
+            pred = Predict(profile=args.profile)
             print(pred.initiate_prediction(args.user_id))
             logger.info("Successfully completed prediction pipeline")
 
+        if args.run_batch_prediction:
+            logger.info("Initiating batch prediction pipeline")
+            from src.pipeline.batch_prediction import BatchPredict
+            batch_predictor = BatchPredict()
+            output_filepath = batch_predictor.initiate_batch_prediction(top_n=args.top_n)
+            print(f"Batch recommendations written to {output_filepath}")
+            logger.info("Successfully completed batch prediction pipeline")
+
+        if args.run_benchmark:
+            logger.info("Initiating benchmark suite")
+            from src.pipeline.benchmark import Benchmark
+            report = Benchmark().initiate_benchmark(
+                size_names=args.benchmark_sizes, baseline_filepath=args.benchmark_baseline
+            )
+            for regression in report.get('regressions', []):
+                print(f"Regression in {regression['size']}/{regression['stage']}: "
+                      f"{regression['baseline_s']:.4f}s -> {regression['current_s']:.4f}s")
+            print(f"Benchmark report written to {BenchmarkConfig().output_filepath}")
+            logger.info("Successfully completed benchmark suite")
+
+        if args.check_import_budget:
+            logger.info("Checking import-time budget")
+            from src.pipeline.benchmark import Benchmark
+            results = Benchmark().check_import_budget()
+            for module, result in results.items():
+                status = "ok" if result['within_budget'] else "OVER BUDGET"
+                print(f"{module}: {result['import_s']:.3f}s (budget {result['budget_s']:.3f}s) {status}")
+            if not all(result['within_budget'] for result in results.values()):
+                sys.exit(1)
+            logger.info("Import-time budget check passed")
+
+        if args.serve:
+            logger.info("Starting recommendation service")
+            from src.pipeline.service import RecommendationService
+            RecommendationService(config=ServiceConfig(host=args.host, port=args.port)).run()
+
+        if args.metrics_file:
+            from src.metrics import metrics
+            metrics.write_prometheus(args.metrics_file)
+            logger.info(f"Metrics written to {args.metrics_file}")
+
     except Exception as e:
         logger.exception("An error occurred during pipeline execution")
         raise CustomException(e, sys)
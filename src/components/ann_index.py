@@ -0,0 +1,142 @@
+from src.logger import logger
+from src.exception import CustomException
+from scipy.sparse import csr_matrix, issparse
+import numpy as np
+import sys
+
+
+def to_dense(matrix):
+    """
+    Returns a sparse or dense matrix product as a 2D NumPy array.
+    """
+    if issparse(matrix):
+        return matrix.toarray()
+    return np.asarray(matrix)
+
+
+def normalize_rows(matrix):
+    """
+    Scales every row of a sparse or dense matrix to unit L2 norm; all-zero rows
+    stay zero. Matches `sklearn.preprocessing.normalize` without importing
+    scikit-learn on the serving path.
+
+    Args:
+        matrix: Sparse or dense 2D matrix.
+
+    Returns:
+        The normalized matrix, CSR when the input is sparse.
+    """
+    if issparse(matrix):
+        matrix = csr_matrix(matrix, copy=True)
+        if not np.issubdtype(matrix.dtype, np.floating):
+            matrix = matrix.astype(np.float64)
+        # bincount accumulates each row's squares in order, as scikit-learn does
+        rows = np.repeat(np.arange(matrix.shape[0]), np.diff(matrix.indptr))
+        norms = np.sqrt(np.bincount(rows, weights=matrix.data * matrix.data, minlength=matrix.shape[0]))
+        matrix.data /= np.where(norms > 0, norms, 1)[rows]
+        return matrix
+    matrix = np.asarray(matrix)
+    if not np.issubdtype(matrix.dtype, np.floating):
+        matrix = matrix.astype(np.float64)
+    norms = np.sqrt(np.einsum('ij,ij->i', matrix, matrix))
+    return matrix / np.where(norms > 0, norms, 1)[:, np.newaxis]
+
+
+class IVFIndex:
+    """
+    Inverted-file index over L2-normalized TF-IDF vectors.
+
+    Courses are clustered with spherical k-means. A query is compared with the
+    cluster centroids first and only the courses in its `n_probe` closest
+    clusters are scored exactly, so `n_probe` trades recall for latency.
+    """
+
+    def __init__(self, centroids, order, offsets):
+        self.centroids = centroids
+        self.order = order
+        self.offsets = offsets
+
+    @property
+    def n_clusters(self):
+        return len(self.centroids)
+
+    @classmethod
+    def build(cls, vectors, n_clusters=None, n_iter=10, block_size=10000, seed=42):
+        """
+        Clusters the course vectors with spherical k-means.
+
+        Args:
+            vectors (scipy.sparse.csr_matrix): L2-normalized TF-IDF matrix.
+            n_clusters (int, optional): Number of clusters. Defaults to sqrt(number of courses).
+            n_iter (int): Number of k-means iterations.
+            block_size (int): Rows assigned per block, bounding the dense similarity buffer.
+            seed (int): Seed for the initial centroid sample.
+
+        Returns:
+            IVFIndex: The built index.
+        """
+        try:
+            n_courses = vectors.shape[0]
+            if n_clusters is None:
+                n_clusters = max(1, int(np.sqrt(n_courses)))
+            n_clusters = min(n_clusters, n_courses)
+            logger.info(f"Building IVF index with {n_clusters} clusters over {n_courses} courses.")
+
+            rng = np.random.default_rng(seed)
+            centroids = vectors[rng.choice(n_courses, n_clusters, replace=False)].toarray()
+            assignments = np.zeros(n_courses, dtype=np.int64)
+            for _ in range(n_iter):
+                for start in range(0, n_courses, block_size):
+                    block = vectors[start:start + block_size]
+                    assignments[start:start + block_size] = to_dense(block @ centroids.T).argmax(axis=1)
+                membership = csr_matrix(
+                    (np.ones(n_courses), (assignments, np.arange(n_courses))),
+                    shape=(n_clusters, n_courses)
+                )
+                sums = to_dense(membership @ vectors)
+                # Keep the previous centroid for clusters that lost all members
+                empty = np.asarray(membership.sum(axis=1)).ravel() == 0
+                sums[empty] = centroids[empty]
+                centroids = normalize_rows(sums)
+
+            order = np.argsort(assignments, kind='stable')
+            offsets = np.concatenate(([0], np.cumsum(np.bincount(assignments, minlength=n_clusters))))
+            return cls(centroids.astype(np.float32), order, offsets)
+        except Exception as e:
+            logger.exception(f"Error occurred while building IVF index: {e}")
+            raise CustomException(e, sys)
+
+    def save(self, filepath):
+        np.savez(filepath, centroids=self.centroids, order=self.order, offsets=self.offsets)
+
+    @classmethod
+    def load(cls, filepath):
+        with np.load(filepath) as data:
+            return cls(data['centroids'], data['order'], data['offsets'])
+
+    def search_scores(self, queries, vectors, n_probe):
+        """
+        Scores queries against the courses of their `n_probe` closest clusters.
+
+        Args:
+            queries: Sparse or dense L2-normalized query matrix.
+            vectors (scipy.sparse.csr_matrix): The indexed TF-IDF matrix.
+            n_probe (int): Number of clusters probed per query.
+
+        Returns:
+            np.ndarray: Cosine similarities of shape (number of queries, number of
+            courses), with -inf for courses that were not probed.
+        """
+        n_queries = queries.shape[0]
+        scores = np.full((n_queries, vectors.shape[0]), -np.inf)
+        centroid_scores = to_dense(queries @ self.centroids.T)
+        n_probe = min(n_probe, self.n_clusters)
+        probes = np.argpartition(-centroid_scores, n_probe - 1, axis=1)[:, :n_probe]
+
+        # Score every probed cluster once for all queries that probe it
+        for cluster in np.unique(probes):
+            query_rows = np.flatnonzero((probes == cluster).any(axis=1))
+            course_rows = self.order[self.offsets[cluster]:self.offsets[cluster + 1]]
+            if len(course_rows):
+                scores[np.ix_(query_rows, course_rows)] = to_dense(queries[query_rows] @ vectors[course_rows].T)
+        return scores
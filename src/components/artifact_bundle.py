@@ -0,0 +1,201 @@
+from src.logger import logger
+from src.exception import CustomException
+from scipy.sparse import csr_matrix
+import pandas as pd
+import numpy as np
+import json
+import sys
+import os
+import re
+
+BUNDLE_FORMAT_VERSION = 1
+META_FILENAME = 'meta.json'
+# Vectorizer settings BundleVectorizer can only reproduce at these values
+FIXED_PARAMS = {
+    'input': 'content',
+    'analyzer': 'word',
+    'preprocessor': None,
+    'tokenizer': None,
+    'strip_accents': None,
+}
+
+
+def unsupported_bundle_params(vectorizer):
+    """
+    Returns:
+        list: Names of the fitted vectorizer's settings that a bundle cannot
+        reproduce; empty when it can be served from a bundle.
+    """
+    params = vectorizer.get_params()
+    unsupported = [name for name, value in FIXED_PARAMS.items() if params.get(name) != value]
+    if params.get('norm') not in ('l1', 'l2', None):
+        unsupported.append('norm')
+    return unsupported
+
+
+def write_bundle(dirpath, matrix, vectorizer, courses, columns, fingerprint=''):
+    """
+    Writes the TF-IDF matrix, vocabulary, IDF weights and course metadata as
+    uncompressed .npy files that can be memory-mapped without copying.
+
+    Args:
+        dirpath (str): Directory of the bundle.
+        matrix (scipy.sparse.csr_matrix): TF-IDF matrix.
+        vectorizer (TfidfVectorizer): The fitted vectorizer.
+        courses (pd.DataFrame): Course data in matrix row order.
+        columns (list): Course columns to store.
+        fingerprint (str): Digest of the TF-IDF artifacts, recorded for the context index.
+    """
+    try:
+        unsupported = unsupported_bundle_params(vectorizer)
+        if unsupported:
+            raise ValueError(f"Vectorizer settings {unsupported} cannot be served from an artifact bundle")
+        os.makedirs(dirpath, exist_ok=True)
+        matrix = csr_matrix(matrix)
+        np.save(os.path.join(dirpath, 'data.npy'), matrix.data)
+        np.save(os.path.join(dirpath, 'indices.npy'), matrix.indices)
+        np.save(os.path.join(dirpath, 'indptr.npy'), matrix.indptr)
+
+        # Columns of a fitted TfidfVectorizer follow the sorted vocabulary
+        vocabulary = sorted(vectorizer.vocabulary_, key=vectorizer.vocabulary_.get)
+        np.save(os.path.join(dirpath, 'vocabulary.npy'), np.array(vocabulary))
+        # Without IDF weighting every term keeps its term frequency
+        idf = vectorizer.idf_ if vectorizer.use_idf else np.ones(len(vocabulary))
+        np.save(os.path.join(dirpath, 'idf.npy'), idf)
+
+        for column in columns:
+            encoded = [str(value).encode('utf-8') for value in courses[column]]
+            offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+            np.cumsum([len(value) for value in encoded], out=offsets[1:])
+            np.save(os.path.join(dirpath, f'{column}.bytes.npy'), np.frombuffer(b''.join(encoded), dtype=np.uint8))
+            np.save(os.path.join(dirpath, f'{column}.offsets.npy'), offsets)
+        np.save(os.path.join(dirpath, 'course_id.npy'), courses['course_id'].to_numpy(dtype=np.int64))
+
+        stop_words = vectorizer.get_stop_words()
+        meta = {
+            'format_version': BUNDLE_FORMAT_VERSION,
+            'shape': list(matrix.shape),
+            'columns': list(columns),
+            'lowercase': vectorizer.lowercase,
+            'token_pattern': vectorizer.token_pattern,
+            'ngram_range': list(vectorizer.ngram_range),
+            'stop_words': sorted(stop_words) if stop_words else [],
+            'binary': vectorizer.binary,
+            'sublinear_tf': vectorizer.sublinear_tf,
+            'norm': vectorizer.norm,
+            'fingerprint': fingerprint,
+        }
+        with open(os.path.join(dirpath, META_FILENAME), 'w') as file:
+            json.dump(meta, file)
+        logger.info(f"Artifact bundle written to {dirpath} successfully!")
+    except Exception as e:
+        logger.exception(f"Error occurred while writing artifact bundle: {e}")
+        raise CustomException(e, sys)
+
+
+class BundleVectorizer:
+    """
+    Transforms text with the vocabulary and IDF weights of a bundle. It mirrors
+    `TfidfVectorizer.transform` for word n-grams, including the binary,
+    sublinear_tf and norm settings, without unpickling the fitted vectorizer.
+    Bundles written before those settings were recorded use the defaults.
+    """
+
+    def __init__(self, vocabulary, idf, meta):
+        self.vocabulary = vocabulary
+        self.idf = idf
+        self.lowercase = meta['lowercase']
+        self.token_pattern = re.compile(meta['token_pattern'])
+        self.ngram_range = tuple(meta['ngram_range'])
+        self.stop_words = frozenset(meta['stop_words'])
+        self.binary = meta.get('binary', False)
+        self.sublinear_tf = meta.get('sublinear_tf', False)
+        self.norm = meta.get('norm', 'l2')
+
+    def analyze(self, text):
+        if self.lowercase:
+            text = text.lower()
+        tokens = [token for token in self.token_pattern.findall(text) if token not in self.stop_words]
+        min_n, max_n = self.ngram_range
+        ngrams = []
+        for n in range(min_n, max_n + 1):
+            ngrams.extend(" ".join(tokens[i:i + n]) for i in range(len(tokens) - n + 1))
+        return ngrams
+
+    def transform(self, texts):
+        """
+        Args:
+            texts (list): Raw documents.
+
+        Returns:
+            scipy.sparse.csr_matrix: TF-IDF rows, normalized as configured.
+        """
+        indptr = [0]
+        indices = [np.empty(0, dtype=np.int64)]
+        values = [np.empty(0)]
+        for text in texts:
+            terms = self.analyze(text)
+            columns = np.empty(0, dtype=np.int64)
+            weights = np.empty(0)
+            if terms:
+                terms = np.array(terms)
+                positions = np.clip(np.searchsorted(self.vocabulary, terms), 0, len(self.vocabulary) - 1)
+                columns, counts = np.unique(positions[self.vocabulary[positions] == terms], return_counts=True)
+                if self.binary:
+                    counts = np.ones_like(counts)
+                tf = np.log(counts) + 1 if self.sublinear_tf else counts
+                weights = tf * self.idf[columns]
+                if len(weights) and self.norm is not None:
+                    weights = weights / np.linalg.norm(weights, ord=1 if self.norm == 'l1' else 2)
+            indices.append(columns)
+            values.append(weights)
+            indptr.append(indptr[-1] + len(columns))
+        indices = np.concatenate(indices)
+        values = np.concatenate(values)
+        return csr_matrix((values, indices, indptr), shape=(len(texts), len(self.vocabulary)))
+
+
+class ArtifactBundle:
+    """
+    Read-only view of an artifact bundle. Every array is opened with np.memmap,
+    so workers on the same host share the page cache instead of private copies.
+    """
+
+    def __init__(self, dirpath):
+        self.dirpath = dirpath
+        with open(os.path.join(dirpath, META_FILENAME)) as file:
+            self.meta = json.load(file)
+        if self.meta['format_version'] != BUNDLE_FORMAT_VERSION:
+            raise ValueError(f"Unsupported bundle format version {self.meta['format_version']}")
+
+        self.vectors = csr_matrix(
+            (self._open('data'), self._open('indices'), self._open('indptr')),
+            shape=tuple(self.meta['shape']),
+            copy=False
+        )
+        self.vectorizer = BundleVectorizer(self._open('vocabulary'), self._open('idf'), self.meta)
+        self.course_ids = self._open('course_id')
+        self._columns = {
+            column: (self._open(f'{column}.bytes'), self._open(f'{column}.offsets'))
+            for column in self.meta['columns']
+        }
+
+    def _open(self, name):
+        return np.load(os.path.join(self.dirpath, f'{name}.npy'), mmap_mode='r')
+
+    def course_frame(self, rows):
+        """
+        Decodes the metadata of the given course rows.
+
+        Args:
+            rows (np.ndarray): Course row positions.
+
+        Returns:
+            pd.DataFrame: Course metadata indexed by row position.
+        """
+        rows = np.asarray(rows, dtype=np.int64)
+        frame = {}
+        for column, (buffer, offsets) in self._columns.items():
+            frame[column] = [bytes(buffer[offsets[row]:offsets[row + 1]]).decode('utf-8') for row in rows]
+        frame['course_id'] = np.asarray(self.course_ids[rows])
+        return pd.DataFrame(frame, index=rows)
@@ -0,0 +1,127 @@
+from src.logger import logger
+import numpy as np
+import threading
+
+
+class ContextIndex:
+    """
+    Course scores of every distinct user context (role and goal).
+
+    Users share a small set of role/goal combinations, so the cosine scan of a
+    context against the catalog is computed once per distinct context string
+    and reused by every user in that segment. Contexts not seen before are
+    scored on first use through `compute` and added to the index.
+    """
+
+    def __init__(self, course_ids, compute, contexts=(), scores=None, fingerprint=''):
+        """
+        Args:
+            course_ids (np.ndarray): Catalog the scores refer to, in row order.
+            compute (Callable): Maps a list of context strings to a score matrix.
+            contexts (Iterable[str]): Contexts of the precomputed score rows.
+            scores (np.ndarray, optional): Precomputed (contexts × courses) scores.
+            fingerprint (str): Digest of the TF-IDF matrix and vectorizer that `compute` scores with.
+        """
+        self.course_ids = course_ids
+        self.compute = compute
+        self.fingerprint = fingerprint
+        self._rows = {context: row for row, context in enumerate(contexts)}
+        self._scores = list(scores) if scores is not None else []
+        self._rankings = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._rows)
+
+    @property
+    def nbytes(self):
+        return sum(row_scores.nbytes for row_scores in self._scores)
+
+    def rows(self, contexts):
+        """
+        Maps contexts to score rows, scoring unseen contexts in one batch.
+
+        Args:
+            contexts (list): Context strings.
+
+        Returns:
+            np.ndarray: Score row of every context.
+        """
+        missing = list(dict.fromkeys(context for context in contexts if context not in self._rows))
+        if missing:
+            scores = self.compute(missing)
+            with self._lock:
+                for context, row_scores in zip(missing, scores):
+                    if context not in self._rows:
+                        # Readers outside the lock may see the row as soon as it is
+                        # published, so its scores must already be in place
+                        self._scores.append(row_scores)
+                        self._rows[context] = len(self._scores) - 1
+            logger.info(f"Context index extended with {len(missing)} new contexts.")
+        return np.array([self._rows[context] for context in contexts], dtype=np.int64)
+
+    def scores(self, contexts):
+        """
+        Returns:
+            np.ndarray: Score matrix of shape (len(contexts), number of courses).
+        """
+        rows = self.rows(contexts)
+        if not len(rows):
+            return np.empty((0, len(self.course_ids)))
+        return np.stack([self._scores[row] for row in rows])
+
+    def ranking(self, context, top_n, rank):
+        """
+        Returns the course rows of a context ranked by score, computed once per
+        context and depth.
+
+        Args:
+            context (str): Context string.
+            top_n (int): Number of courses.
+            rank (Callable): Maps a (1 × courses) score matrix and `top_n` to column indices.
+
+        Returns:
+            np.ndarray: Course rows with finite scores, best first.
+        """
+        key = (context, top_n)
+        ranking = self._rankings.get(key)
+        if ranking is None:
+            scores = self.scores([context])
+            ranking = rank(scores, top_n)[0]
+            ranking = ranking[np.isfinite(scores[0, ranking])]
+            self._rankings[key] = ranking
+        return ranking
+
+    def save(self, filepath):
+        contexts = sorted(self._rows, key=self._rows.get)
+        np.savez(
+            filepath,
+            contexts=np.array(contexts, dtype=str),
+            scores=np.stack(self._scores) if self._scores else np.empty((0, len(self.course_ids))),
+            course_ids=self.course_ids,
+            fingerprint=self.fingerprint,
+        )
+
+    @classmethod
+    def load(cls, filepath, course_ids, compute, dtype=None, fingerprint=''):
+        """
+        Loads a saved index; it is discarded when it was built for a different
+        catalog or from a different TF-IDF matrix or vectorizer.
+
+        Args:
+            dtype (np.dtype, optional): Value type to hold the scores in; as saved when omitted.
+            fingerprint (str): Digest of the TF-IDF matrix and vectorizer now in use;
+                without one a saved index cannot be trusted and is discarded.
+
+        Returns:
+            ContextIndex: The loaded index, or an empty one.
+        """
+        with np.load(filepath) as data:
+            if not np.array_equal(data['course_ids'], course_ids):
+                logger.warning(f"Context index at {filepath} does not match the course catalog; rebuilding lazily.")
+                return cls(course_ids, compute, fingerprint=fingerprint)
+            if not fingerprint or 'fingerprint' not in data.files or str(data['fingerprint']) != fingerprint:
+                logger.warning(f"Context index at {filepath} was built from other TF-IDF weights; rebuilding lazily.")
+                return cls(course_ids, compute, fingerprint=fingerprint)
+            scores = data['scores'] if dtype is None else data['scores'].astype(dtype)
+            return cls(course_ids, compute, data['contexts'].tolist(), scores, fingerprint)
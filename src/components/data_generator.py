@@ -0,0 +1,153 @@
+from src.logger import logger
+from src.exception import CustomException
+from src.config.data_generator import DataGeneratorConfig
+import pandas as pd
+import numpy as np
+import sys
+import os
+
+ROLES = [
+    'Data Scientist', 'Software Engineer', 'AI Specialist', 
+    'Machine Learning Engineer', 'Data Analyst', 'DevOps Engineer', 
+    'Cybersecurity Analyst', 'Database Administrator', 
+    'Cloud Engineer', 'Business Intelligence Analyst'
+]
+GOALS = [
+    'Learn ML', 'Improve Python', 'Deepen AI knowledge', 
+    'Master SQL', 'Enhance Data Visualization', 'Boost Cloud Skills', 
+    'Strengthen Cybersecurity', 'Optimize Databases', 
+    'Advance in DevOps', 'Explore BI Tools'
+]
+RATING_PROBABILITIES = [0.05, 0.1, 0.2, 0.35, 0.3]  # Probability of ratings 1 to 5
+
+
+class DataGenerator:
+    def __init__(self, config=None):
+        self.config = config if config is not None else DataGeneratorConfig()
+        self.rng = np.random.default_rng(self.config.seed)
+
+    def generate_users(self):
+        """
+        Generates user details with a random role and goal per user.
+
+        Returns:
+            pd.DataFrame: DataFrame with user IDs, roles, and goals.
+        """
+        num_users = self.config.num_users
+        return pd.DataFrame({
+            'user_id': np.arange(1, num_users + 1),
+            'role': self.rng.choice(ROLES, num_users),
+            'goal': self.rng.choice(GOALS, num_users)
+        })
+
+    def generate_courses(self):
+        """
+        Generates a catalog of `num_courses` courses by cycling through the scraped
+        courses, numbering repeated titles so every course stays distinct.
+
+        Returns:
+            pd.DataFrame: Course details with course IDs.
+        """
+        base = pd.read_csv(self.config.course_filepath)
+        rows = np.arange(self.config.num_courses)
+        courses = base.iloc[rows % len(base)].reset_index(drop=True)
+        repeat = rows // len(base)
+        courses.loc[repeat > 0, 'Title'] = courses['Title'][repeat > 0] + " #" + repeat[repeat > 0].astype(str)
+        courses['course_id'] = rows + 1
+        return courses
+
+    def sample_pairs(self, user_weights, course_weights, num_ratings):
+        """
+        Samples distinct (user, course) pairs, drawing users by activity and
+        courses by popularity. Pairs are encoded as `user * num_courses + course`
+        so duplicates are removed with one vectorized sort per draw. Draws are
+        oversampled so a single pass almost always suffices.
+
+        Args:
+            user_weights (np.ndarray): Relative activity of each user in the block.
+            course_weights (np.ndarray): Relative popularity of each course.
+            num_ratings (int): Number of distinct pairs to return.
+
+        Returns:
+            tuple: User and course positions of the sampled pairs.
+        """
+        num_users, num_courses = len(user_weights), len(course_weights)
+        capacity = num_users * num_courses
+        num_ratings = min(num_ratings, capacity)
+        if num_ratings > capacity // 2:
+            # Dense blocks: sample codes uniformly without replacement
+            codes = self.rng.choice(capacity, num_ratings, replace=False)
+            return codes // num_courses, codes % num_courses
+
+        user_p = user_weights / user_weights.sum()
+        course_p = course_weights / course_weights.sum()
+        codes = np.empty(0, dtype=np.int64)
+        while len(codes) < num_ratings:
+            # Multinomial draw counts pair users with a shuffled list of courses
+            draws = int((num_ratings - len(codes)) * 1.3) + 64
+            users = np.repeat(np.arange(num_users), self.rng.multinomial(draws, user_p))
+            courses = self.rng.permutation(np.repeat(np.arange(num_courses), self.rng.multinomial(draws, course_p)))
+            codes = np.concatenate([codes, users.astype(np.int64) * num_courses + courses])
+            codes.sort()
+            codes = codes[np.concatenate(([True], codes[1:] != codes[:-1]))]
+        codes = self.rng.choice(codes, num_ratings, replace=False)
+        return codes // num_courses, codes % num_courses
+
+    def iter_ratings(self):
+        """
+        Generates unique ratings block by block of users, with Zipf-distributed
+        course popularity and lognormal user activity.
+
+        Yields:
+            pd.DataFrame: Chunks of ratings with user IDs, course IDs and ratings.
+        """
+        num_users, num_courses = self.config.num_users, self.config.num_courses
+        course_weights = np.arange(1, num_courses + 1, dtype=np.float64) ** -self.config.popularity_skew
+        course_weights = course_weights[self.rng.permutation(num_courses)]
+        user_weights = self.rng.lognormal(0.0, self.config.activity_sigma, num_users)
+
+        # Split users into blocks of about `chunk_size` ratings each
+        num_blocks = max(1, -(-self.config.num_ratings // self.config.chunk_size))
+        bounds = np.linspace(0, num_users, num_blocks + 1).astype(np.int64)
+        block_weights = np.add.reduceat(user_weights, bounds[:-1])
+        block_ratings = np.floor(self.config.num_ratings * block_weights / user_weights.sum()).astype(np.int64)
+        block_ratings[-1] += self.config.num_ratings - block_ratings.sum()
+
+        for start, end, num_ratings in zip(bounds[:-1], bounds[1:], block_ratings):
+            users, courses = self.sample_pairs(user_weights[start:end], course_weights, num_ratings)
+            yield pd.DataFrame({
+                'user_id': users + start + 1,
+                'course_id': courses + 1,
+                'rating': self.rng.choice(np.arange(1, 6), len(users), p=RATING_PROBABILITIES)
+            })
+
+    def initiate_data_generation(self):
+        """
+        Writes synthetic courses.csv, users.csv and ratings.csv to the output
+        directory, streaming ratings to disk chunk by chunk.
+
+        Returns:
+            str: The output directory.
+        """
+        try:
+            output_dirpath = self.config.output_dirpath
+            os.makedirs(output_dirpath, exist_ok=True)
+            logger.info(f"Generating {self.config.num_users} users, {self.config.num_courses} courses and "
+                        f"{self.config.num_ratings} ratings into {output_dirpath}.")
+
+            self.generate_courses().to_csv(os.path.join(output_dirpath, 'courses.csv'), index=False)
+            self.generate_users().to_csv(os.path.join(output_dirpath, 'users.csv'), index=False)
+
+            ratings_filepath = os.path.join(output_dirpath, 'ratings.csv')
+            pd.DataFrame(columns=['user_id', 'course_id', 'rating']).to_csv(ratings_filepath, index=False)
+            n_written = 0
+            for chunk in self.iter_ratings():
+                chunk.to_csv(ratings_filepath, mode='a', header=False, index=False)
+                n_written += len(chunk)
+                logger.info(f"Wrote {n_written} ratings to {ratings_filepath}.")
+
+            logger.info(f"Synthetic data written to {output_dirpath} successfully!")
+            return output_dirpath
+        except Exception as e:
+            logger.exception(f"Error occurred during synthetic data generation: {e}")
+            raise CustomException(e, sys)
@@ -1,17 +1,62 @@
 from src.logger import logger
+from src.metrics import metrics, ROWS_HELP
 from src.exception import CustomException
 from src.config.data_transformation import DataTransformationArtifact, DataTransformationInput
+from src.components.ann_index import IVFIndex
+from src.components.similarity_graph import SimilarityGraph
+from src.components.artifact_bundle import write_bundle, unsupported_bundle_params
 import pandas as pd
 import numpy as np
-from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.feature_extraction.text import TfidfVectorizer, TfidfTransformer
+from concurrent.futures import ProcessPoolExecutor
+from numbers import Integral
+from sklearn.preprocessing import normalize
+import hashlib
+import shutil
 import sys
+import os
 import joblib
-from scipy.sparse import save_npz
+from scipy.sparse import save_npz, load_npz, vstack, diags, csr_matrix
+
+
+def count_shard(texts, tfidf_params):
+    """
+    Tokenizes a shard of documents and counts their n-grams. Runs in a worker process.
+
+    Args:
+        texts (list): Documents of the shard.
+        tfidf_params (dict): TfidfVectorizer parameters; they define the analyzer.
+
+    Returns:
+        tuple: The shard's terms in order of first occurrence and a CSR count
+        matrix whose columns index them.
+    """
+    analyze = TfidfVectorizer(**tfidf_params).build_analyzer()
+    vocabulary = {}
+    indices = []
+    values = []
+    indptr = [0]
+    for text in texts:
+        counts = {}
+        for term in analyze(text):
+            index = vocabulary.setdefault(term, len(vocabulary))
+            counts[index] = counts.get(index, 0) + 1
+        indices.extend(counts)
+        values.extend(counts.values())
+        indptr.append(len(indices))
+
+    terms = np.array(list(vocabulary), dtype=str) if vocabulary else np.empty(0, dtype=str)
+    counts = csr_matrix(
+        (np.array(values, dtype=np.float64), np.array(indices, dtype=np.int64), np.array(indptr)),
+        shape=(len(texts), len(terms))
+    )
+    return terms, counts
+
 
 class DataTransformation:
-    def __init__(self):
-        self.input = DataTransformationInput()
-        self.artifact = DataTransformationArtifact()
+    def __init__(self, input_config=None, artifact_config=None):
+        self.input = input_config if input_config is not None else DataTransformationInput()
+        self.artifact = artifact_config if artifact_config is not None else DataTransformationArtifact()
 
     def get_vectors(self, df):
         """
@@ -24,11 +69,15 @@ class DataTransformation:
             np.ndarray: TF-IDF matrix as a NumPy array.
         """
         try:
-            logger.info("Combining text fields for TF-IDF vectorization.")
-            df['combined_text'] = df['Title'] + " " + df['Description'] + " " + df['Instructor'] + " " + df['Learn'] + " " + df['Keywords']
+            df['combined_text'] = self.get_combined_text(df)
+            n_jobs = os.cpu_count() if self.artifact.n_jobs == -1 else self.artifact.n_jobs
+            # A fixed vocabulary is not learned, so there is nothing to merge across shards
+            parallel = self.artifact.tfidf_params.get('vocabulary') is None
+            if parallel and n_jobs > 1 and len(df) >= self.artifact.parallel_min_courses:
+                return self.get_vectors_parallel(df['combined_text'].tolist(), n_jobs)
 
             logger.info("Vectorizing text data using TF-IDF.")
-            tfidf_vectorizer = TfidfVectorizer(stop_words='english', ngram_range=(1, 3), max_features=5000)
+            tfidf_vectorizer = TfidfVectorizer(**self.artifact.tfidf_params)
             tfidf_matrix = tfidf_vectorizer.fit_transform(df['combined_text'])
 
             logger.info("TF-IDF vectorization completed successfully.")
@@ -37,6 +86,227 @@ class DataTransformation:
             logger.exception(f"Error occurred during TF-IDF vectorization: {e}")
             raise CustomException(e, sys)
 
+    def get_vectors_parallel(self, texts, n_jobs):
+        """
+        Fits TF-IDF across worker processes with the same result as a serial
+        `TfidfVectorizer.fit_transform`. Each worker counts the n-grams of one
+        contiguous shard; the shard vocabularies are merged into one sorted
+        vocabulary, the document-frequency and max_features limits are applied
+        as scikit-learn applies them, and the IDF weighting is fitted on the
+        merged counts.
+
+        Args:
+            texts (list): Combined text of every course.
+            n_jobs (int): Number of worker processes.
+
+        Returns:
+            tuple: The fitted TfidfVectorizer and the TF-IDF matrix.
+        """
+        try:
+            params = self.artifact.tfidf_params
+            logger.info(f"Vectorizing text data using TF-IDF across {n_jobs} processes.")
+            shard_size = -(-len(texts) // n_jobs)
+            shards = [texts[start:start + shard_size] for start in range(0, len(texts), shard_size)]
+            with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+                results = list(executor.map(count_shard, shards, [params] * len(shards)))
+
+            # Number terms by first occurrence across the ordered shards, as a serial
+            # fit does, so rows keep the same entry order and sums round identically
+            all_terms = np.concatenate([shard_terms for shard_terms, _ in results])
+            terms, first_seen, term_rows = np.unique(all_terms, return_index=True, return_inverse=True)
+            insertion_order = np.argsort(first_seen)
+            insertion_ids = np.empty(len(terms), dtype=np.int64)
+            insertion_ids[insertion_order] = np.arange(len(terms))
+            blocks = []
+            offset = 0
+            for shard_terms, shard_counts in results:
+                columns = insertion_ids[term_rows[offset:offset + len(shard_terms)]]
+                offset += len(shard_terms)
+                blocks.append(csr_matrix(
+                    (shard_counts.data, columns[shard_counts.indices], shard_counts.indptr),
+                    shape=(shard_counts.shape[0], len(terms))
+                ))
+            counts = vstack(blocks).tocsr()
+            counts.sort_indices()
+            # Renumber to the sorted vocabulary without reordering the entries
+            counts.indices = insertion_order[counts.indices].astype(counts.indices.dtype)
+
+            tfidf_vectorizer = TfidfVectorizer(**params)
+            counts = counts.astype(tfidf_vectorizer.dtype, copy=False)
+            if tfidf_vectorizer.binary:
+                counts.data.fill(1)
+            counts, terms = self.limit_features(counts, terms, tfidf_vectorizer)
+            if len(terms) == 0:
+                raise ValueError("After pruning, no terms remain. Try a lower min_df or a higher max_df.")
+
+            tfidf_transformer = TfidfTransformer(
+                norm=tfidf_vectorizer.norm, use_idf=tfidf_vectorizer.use_idf,
+                smooth_idf=tfidf_vectorizer.smooth_idf, sublinear_tf=tfidf_vectorizer.sublinear_tf
+            ).fit(counts)
+            tfidf_matrix = tfidf_transformer.transform(counts, copy=False)
+
+            # Fitted state as fit_transform leaves it; transform() applies the
+            # fitted transformer, which also carries the settings without IDF
+            tfidf_vectorizer.vocabulary_ = {term: index for index, term in enumerate(terms.tolist())}
+            tfidf_vectorizer.fixed_vocabulary_ = False
+            tfidf_vectorizer._tfidf = tfidf_transformer
+            logger.info("Parallel TF-IDF vectorization completed successfully.")
+            return tfidf_vectorizer, tfidf_matrix
+        except Exception as e:
+            logger.exception(f"Error occurred during parallel TF-IDF vectorization: {e}")
+            raise CustomException(e, sys)
+
+    def limit_features(self, counts, terms, tfidf_vectorizer):
+        """
+        Applies max_df, min_df and max_features exactly as CountVectorizer does,
+        including its tie order among equally frequent terms.
+
+        Returns:
+            tuple: The pruned count matrix and its terms.
+        """
+        n_docs = counts.shape[0]
+        max_df, min_df = tfidf_vectorizer.max_df, tfidf_vectorizer.min_df
+        max_doc_count = max_df if isinstance(max_df, Integral) else max_df * n_docs
+        min_doc_count = min_df if isinstance(min_df, Integral) else min_df * n_docs
+        if max_doc_count < min_doc_count:
+            raise ValueError("max_df corresponds to < documents than min_df")
+
+        doc_freq = np.bincount(counts.indices, minlength=counts.shape[1])
+        mask = (doc_freq <= max_doc_count) & (doc_freq >= min_doc_count)
+        limit = tfidf_vectorizer.max_features
+        if limit is not None and mask.sum() > limit:
+            term_freq = np.asarray(counts.sum(axis=0)).ravel()
+            mask_indices = (-term_freq[mask]).argsort()[:limit]
+            new_mask = np.zeros(len(mask), dtype=bool)
+            new_mask[np.where(mask)[0][mask_indices]] = True
+            mask = new_mask
+        kept = np.where(mask)[0]
+        return counts[:, kept], terms[kept]
+
+    def get_combined_text(self, df):
+        """
+        Combines the text fields of every course into one document.
+
+        Args:
+            df (pd.DataFrame): The DataFrame containing the course data.
+
+        Returns:
+            pd.Series: Combined text per course.
+        """
+        logger.info("Combining text fields for TF-IDF vectorization.")
+        return df['Title'] + " " + df['Description'] + " " + df['Instructor'] + " " + df['Learn'] + " " + df['Keywords']
+
+    def get_content_hashes(self, df):
+        """
+        Args:
+            df (pd.DataFrame): Course data with a 'combined_text' column.
+
+        Returns:
+            np.ndarray: SHA-1 hex digest of every course's combined text.
+        """
+        return np.array([hashlib.sha1(text.encode('utf-8')).hexdigest() for text in df['combined_text']])
+
+    def get_fingerprint(self, matrix, vectorizer):
+        """
+        Args:
+            matrix (scipy.sparse.csr_matrix): The TF-IDF matrix.
+            vectorizer (TfidfVectorizer): The fitted vectorizer.
+
+        Returns:
+            str: Digest of the matrix and of the vocabulary and IDF weights, which
+            together determine every context score. Serving compares it instead
+            of hashing the matrix on every load.
+        """
+        matrix = csr_matrix(matrix)
+        digest = hashlib.sha1()
+        for array in (matrix.indptr, matrix.indices, matrix.data):
+            digest.update(np.ascontiguousarray(array).tobytes())
+        terms = sorted(vectorizer.vocabulary_, key=vectorizer.vocabulary_.get)
+        digest.update("\n".join(terms).encode('utf-8'))
+        if vectorizer.use_idf:
+            digest.update(np.asarray(vectorizer.idf_, dtype=np.float64).tobytes())
+        return digest.hexdigest()
+
+    def save_state(self, df, matrix, fingerprint):
+        """
+        Saves what incremental updates need: the course id and content hash of
+        every matrix row and the document frequency of every vocabulary term,
+        together with the fingerprint of the TF-IDF artifacts.
+
+        Args:
+            df (pd.DataFrame): Course data with a 'combined_text' column, in matrix row order.
+            matrix (scipy.sparse.csr_matrix): The TF-IDF matrix.
+            fingerprint (str): Output of `get_fingerprint`.
+        """
+        try:
+            np.savez(
+                self.artifact.state_filepath,
+                course_ids=df['course_id'].to_numpy(dtype=np.int64),
+                hashes=self.get_content_hashes(df),
+                doc_freq=np.bincount(matrix.indices, minlength=matrix.shape[1]),
+                fingerprint=fingerprint,
+            )
+            logger.info(f"TF-IDF state saved to {self.artifact.state_filepath} successfully!")
+        except Exception as e:
+            logger.exception(f"Error occurred while saving TF-IDF state: {e}")
+            raise CustomException(e, sys)
+
+    def update_vectors(self, df):
+        """
+        Incrementally updates the stored TF-IDF matrix. Only new or edited courses
+        are tokenized; document frequencies are adjusted for added and removed
+        rows and unchanged rows are rescaled to the updated IDF weights. The
+        vocabulary stays fixed until the next full fit, so terms that are new to
+        the catalog are ignored.
+
+        Args:
+            df (pd.DataFrame): The DataFrame containing the course data.
+
+        Returns:
+            tuple: The updated TfidfVectorizer and TF-IDF matrix in `df` row order.
+        """
+        try:
+            df['combined_text'] = self.get_combined_text(df)
+            tfidf_vectorizer = joblib.load(self.artifact.vectorizer_filepath)
+            old_matrix = load_npz(self.artifact.vector_filepath).tocsr()
+            with np.load(self.artifact.state_filepath) as state:
+                old_course_ids = state['course_ids']
+                old_hashes = state['hashes']
+                doc_freq = state['doc_freq'].astype(np.int64)
+
+            # Match current courses to stored rows by course_id and content hash
+            old_rows = pd.Series(np.arange(len(old_course_ids)), index=old_course_ids)
+            old_rows = old_rows.reindex(df['course_id'].to_numpy()).fillna(-1).to_numpy(dtype=np.int64)
+            hashes = self.get_content_hashes(df)
+            unchanged = old_rows >= 0
+            unchanged[unchanged] = old_hashes[old_rows[unchanged]] == hashes[unchanged]
+            changed = np.flatnonzero(~unchanged)
+            removed = np.setdiff1d(np.arange(len(old_course_ids)), old_rows[unchanged])
+            logger.info(f"Incremental TF-IDF update: {len(changed)} new or edited, {len(removed)} removed or replaced courses.")
+
+            # Update document frequencies and IDF without re-tokenizing unchanged courses
+            old_idf = tfidf_vectorizer.idf_
+            doc_freq -= np.bincount(old_matrix[removed].indices, minlength=old_matrix.shape[1])
+            new_rows = tfidf_vectorizer.transform(df['combined_text'].iloc[changed])
+            doc_freq += np.bincount(new_rows.indices, minlength=old_matrix.shape[1])
+            n_docs = len(df)
+            tfidf_vectorizer.idf_ = np.log((1 + n_docs) / (1 + doc_freq)) + 1
+
+            # Rescale rows to the new IDF; L2 normalisation absorbs the old weights
+            rescale = diags(tfidf_vectorizer.idf_ / old_idf)
+            matrix = vstack([
+                normalize(old_matrix[old_rows[unchanged]] @ rescale),
+                normalize(new_rows @ rescale),
+            ])
+            order = np.concatenate([np.flatnonzero(unchanged), changed])
+            matrix = matrix.tocsr()[np.argsort(order)]
+
+            logger.info("Incremental TF-IDF update completed successfully.")
+            return tfidf_vectorizer, matrix
+        except Exception as e:
+            logger.exception(f"Error occurred during incremental TF-IDF update: {e}")
+            raise CustomException(e, sys)
+
     def get_cleaned_data(self, df):
         """
         Cleans the DataFrame by filling missing values in specific columns.
@@ -58,10 +328,15 @@ class DataTransformation:
             logger.exception(f"Error occurred during data cleaning: {e}")
             raise CustomException(e, sys)
 
-    def initiate_data_transformation(self):
+    def initiate_data_transformation(self, incremental=False):
         """
         Orchestrates the data transformation process, including cleaning data,
         vectorizing text, and saving the resulting NumPy array to a CSV file.
+
+        Args:
+            incremental (bool): Update the stored TF-IDF matrix for new or edited
+                courses instead of refitting on the whole catalog. Falls back to a
+                full fit when no previous state exists.
         """
         try:
             logger.info("Initiating data transformation process.")
@@ -74,7 +349,13 @@ class DataTransformation:
             df = self.get_cleaned_data(df)
             
             # Generate TF-IDF vectors
-            tfidf_vectorizer, matrix = self.get_vectors(df)
+            if incremental and os.path.exists(self.artifact.state_filepath):
+                tfidf_vectorizer, matrix = self.update_vectors(df)
+            else:
+                tfidf_vectorizer, matrix = self.get_vectors(df)
+            fingerprint = self.get_fingerprint(matrix, tfidf_vectorizer)
+            self.save_state(df, matrix, fingerprint)
+            metrics.set_gauge('dataset_rows', matrix.shape[0], ROWS_HELP, table='courses')
             
             # Save the NumPy array to a CSV file
             save_npz(self.artifact.vector_filepath, matrix)
@@ -83,6 +364,29 @@ class DataTransformation:
             # Save the TfidfVectorizer object for later use
             joblib.dump(tfidf_vectorizer, self.artifact.vectorizer_filepath)
             logger.info(f"Vectorizer saved to {self.artifact.vectorizer_filepath} successfully!")
+
+            # Build the approximate nearest-neighbour index over the course vectors
+            ann_index = IVFIndex.build(matrix)
+            ann_index.save(self.artifact.ann_index_filepath)
+            logger.info(f"ANN index saved to {self.artifact.ann_index_filepath} successfully!")
+
+            # Precompute every course's nearest neighbours for related-course lookups
+            similarity_graph = SimilarityGraph.build(
+                matrix, k=self.artifact.similarity_k, block_bytes=self.artifact.similarity_block_bytes
+            )
+            similarity_graph.save(self.artifact.similarity_graph_filepath)
+            logger.info(f"Similarity graph saved to {self.artifact.similarity_graph_filepath} successfully!")
+
+            # Write the uncompressed, memory-mappable bundle for fast cold starts
+            unsupported = unsupported_bundle_params(tfidf_vectorizer)
+            if unsupported:
+                # Remove any older bundle so serving falls back to the pickled vectorizer
+                logger.warning(f"Vectorizer settings {unsupported} cannot be served from a bundle; not writing one.")
+                shutil.rmtree(self.artifact.bundle_dirpath, ignore_errors=True)
+            else:
+                write_bundle(
+                    self.artifact.bundle_dirpath, matrix, tfidf_vectorizer, df, self.artifact.bundle_columns, fingerprint
+                )
         
         
         except Exception as e:
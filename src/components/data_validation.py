@@ -1,103 +1,283 @@
 from src.logger import logger
 from src.exception import CustomException
 from src.config.data_validation import DataValidationArtifact, DataValidationInput
+from concurrent.futures import ThreadPoolExecutor
 import pandas as pd
+import numpy as np
 import yaml
 import sys
 
+EXPECTED_DTYPES = {
+    'Title': 'object',
+    'Instructor': 'object',
+    'Keywords': 'object',
+    'Learn': 'object',
+    'Description': 'object',
+    'course_id': 'int64'
+}
+
+LENGTH_CONSTRAINTS = {
+    'Title': (1, 100),
+    'Instructor': (1, 50),
+    'Keywords': (1, 1000),
+    'Learn': (1, 2000),
+    'Description': (1, 2000)
+}
+
+
+def string_lengths(series):
+    """
+    Computes len(str(x)) for every value without a per-row Python call.
+    Missing values count as the three characters of 'nan'.
+
+    Args:
+        series (pd.Series): Column to measure.
+
+    Returns:
+        np.ndarray: Length of every value.
+    """
+    if pd.api.types.is_string_dtype(series.dtype) or series.dtype == object:
+        lengths = series.str.len()
+    else:
+        lengths = pd.Series(np.nan, index=series.index)
+    lengths = lengths.where(series.notna(), 3)
+    # Non-string values in an object column are converted only where needed
+    others = lengths.isna()
+    if others.any():
+        lengths[others] = series[others].astype(str).str.len()
+    return lengths.to_numpy(dtype=np.int64)
+
+
+def dtype_matches(dtype, expected):
+    """
+    Returns:
+        bool: True if a column dtype satisfies the expected dtype. Text columns
+        read as the dedicated string dtype count as 'object'.
+    """
+    if expected == 'object':
+        return dtype == object or pd.api.types.is_string_dtype(dtype)
+    return str(dtype) == expected
+
+
+def column_dtype(dtypes, has_missing):
+    """
+    Infers the dtype pandas gives a whole column from the dtypes of the chunks
+    it was read in. Chunks where the column is entirely missing are parsed as
+    float64 whatever the column holds, so they are left out of `dtypes`.
+
+    Args:
+        dtypes (set): Dtypes of the chunks holding at least one value.
+        has_missing (bool): Whether the column has missing values anywhere.
+
+    Returns:
+        np.dtype: Dtype of the column as a whole, or None if it is absent.
+    """
+    if not dtypes:
+        return np.dtype('float64') if has_missing else None
+    if len(dtypes) == 1:
+        dtype = next(iter(dtypes))
+        # Missing values turn an integer column into float64
+        return np.dtype('float64') if has_missing and pd.api.types.is_integer_dtype(dtype) else dtype
+    if all(pd.api.types.is_numeric_dtype(dtype) and not pd.api.types.is_bool_dtype(dtype) for dtype in dtypes):
+        return np.dtype('float64')
+    if all(pd.api.types.is_string_dtype(dtype) for dtype in dtypes):
+        return next(iter(dtypes))
+    return np.dtype(object)
+
+
+class ValidationState:
+    """
+    Counts and sample failing rows of every check, accumulated chunk by chunk.
+    """
+
+    def __init__(self, max_samples):
+        self.max_samples = max_samples
+        self.rows = 0
+        self.missing = {}
+        # Dtypes of the chunks where a column holds at least one value
+        self.dtypes = {column: set() for column in EXPECTED_DTYPES}
+        self.present = set()
+        self.lengths = {column: {'count': 0, 'samples': []} for column in LENGTH_CONSTRAINTS}
+        self.course_ids = []
+
+    def add_samples(self, samples, new_samples):
+        samples.extend(new_samples[:self.max_samples - len(samples)])
+
+
 class DataValidation:
-    def __init__(self):
-        self.input = DataValidationInput()
-        self.artifact = DataValidationArtifact()
-    
-    def validate_data(self, df):
+    def __init__(self, input_config=None, artifact_config=None):
+        self.input = input_config if input_config is not None else DataValidationInput()
+        self.artifact = artifact_config if artifact_config is not None else DataValidationArtifact()
+
+    def check_missing(self, chunk, column):
+        """
+        Returns:
+            tuple: Missing value count and sample row numbers of one column.
         """
-        Validate the data in the given DataFrame and write results to a YAML file.
+        missing = chunk[column].isna().to_numpy()
+        return int(missing.sum()), chunk.index[missing][:self.artifact.max_samples].tolist()
 
-        Args:
-            df (pd.DataFrame): The DataFrame to validate.
+    def check_length(self, chunk, column):
+        """
+        Returns:
+            tuple: Count and samples of rows violating the column's length constraint.
+        """
+        min_length, max_length = LENGTH_CONSTRAINTS[column]
+        lengths = string_lengths(chunk[column])
+        invalid = np.flatnonzero((lengths < min_length) | (lengths > max_length))
+        samples = [
+            {'row': int(chunk.index[row]), 'course_id': self.sample_course_id(chunk, row), 'length': int(lengths[row])}
+            for row in invalid[:self.artifact.max_samples]
+        ]
+        return len(invalid), samples
+
+    def sample_course_id(self, chunk, row):
+        if 'course_id' not in chunk:
+            return None
+        value = chunk['course_id'].iloc[row]
+        return int(value) if pd.notna(value) and float(value).is_integer() else str(value)
+
+    def validate_chunk(self, chunk, state, executor):
+        """
+        Runs every column check on one chunk and accumulates the results.
+        Independent column checks run concurrently on the executor.
+        """
+        state.rows += len(chunk)
+        for column in EXPECTED_DTYPES:
+            if column in chunk:
+                state.present.add(column)
+                if chunk[column].notna().any():
+                    state.dtypes[column].add(chunk[column].dtype)
+        missing_checks = {column: executor.submit(self.check_missing, chunk, column) for column in chunk.columns}
+        length_checks = {
+            column: executor.submit(self.check_length, chunk, column)
+            for column in LENGTH_CONSTRAINTS if column in chunk
+        }
+        if 'course_id' in chunk:
+            state.course_ids.append(chunk['course_id'].to_numpy())
+
+        for column, future in missing_checks.items():
+            count, samples = future.result()
+            if count:
+                missing = state.missing.setdefault(column, {'count': 0, 'samples': []})
+                missing['count'] += count
+                state.add_samples(missing['samples'], samples)
+        for column, future in length_checks.items():
+            count, samples = future.result()
+            state.lengths[column]['count'] += count
+            state.add_samples(state.lengths[column]['samples'], samples)
+
+    def build_report(self, state):
+        """
+        Turns the accumulated check results into the validation report.
 
         Returns:
-            dict: Validation results with pass/fail status and reasons for failure.
+            dict: Validation results with pass/fail status, reasons, failing
+            row counts and sample rows.
         """
         validation_results = {
             'missing_values': {},
             'data_types': {},
             'unique_constraints': {},
             'length_constraints': {},
+            'rows': state.rows,
             'status': 'Pass'  # Default to Pass, will be updated to Fail if any validation fails
         }
 
-        try:
-            # 1. Check for missing values in critical columns
-            missing_values = df.isnull().sum()
-            for column, count in missing_values[missing_values > 0].items():
-                validation_results['missing_values'][column] = {
+        # 1. Check for missing values in critical columns
+        for column, missing in state.missing.items():
+            validation_results['missing_values'][column] = {
+                'status': 'Fail',
+                'reason': f"{missing['count']} missing values found",
+                'count': missing['count'],
+                'samples': missing['samples']
+            }
+            validation_results['status'] = 'Fail'
+
+        # 2. Check data types of every column as a whole
+        for column, dtype in EXPECTED_DTYPES.items():
+            actual = column_dtype(state.dtypes[column], column in state.missing)
+            if column not in state.present or not dtype_matches(actual, dtype):
+                actual = str(actual) if column in state.present else 'missing column'
+                validation_results['data_types'][column] = {
                     'status': 'Fail',
-                    'reason': f'{count} missing values found'
+                    'expected': dtype,
+                    'actual': actual,
+                    'reason': f'Expected {dtype} but got {actual}'
                 }
                 validation_results['status'] = 'Fail'
+            else:
+                validation_results['data_types'][column] = {'status': 'Pass'}
 
-            # 2. Check data types
-            expected_dtypes = {
-                'Title': 'object',
-                'Instructor': 'object',
-                'Keywords': 'object',
-                'Learn': 'object',
-                'Description': 'object',
-                'course_id': 'int64'
+        # 3. Validate unique constraints for 'course_id' across all chunks
+        course_ids = np.concatenate(state.course_ids) if state.course_ids else np.empty(0)
+        # value_counts rather than np.unique, which cannot sort ids of mixed types
+        counts = pd.Series(course_ids).value_counts(sort=False)
+        duplicates = counts[counts > 1]
+        if len(duplicates):
+            validation_results['unique_constraints']['course_id'] = {
+                'status': 'Fail',
+                'reason': 'Duplicate values found',
+                'count': int((duplicates - 1).sum()),
+                'samples': duplicates.index[:state.max_samples].tolist()
             }
-            for column, dtype in expected_dtypes.items():
-                actual_dtype = str(df[column].dtype)
-                if actual_dtype != dtype:
-                    validation_results['data_types'][column] = {
-                        'status': 'Fail',
-                        'expected': dtype,
-                        'actual': actual_dtype,
-                        'reason': f'Expected {dtype} but got {actual_dtype}'
-                    }
-                    validation_results['status'] = 'Fail'
-                else:
-                    validation_results['data_types'][column] = {'status': 'Pass'}
-
-            # 3. Validate unique constraints for 'course_id'
-            if df['course_id'].duplicated().any():
-                validation_results['unique_constraints']['course_id'] = {
+            validation_results['status'] = 'Fail'
+        else:
+            validation_results['unique_constraints']['course_id'] = {'status': 'Pass'}
+
+        # 4. Check length constraints (if applicable)
+        for column, (min_length, max_length) in LENGTH_CONSTRAINTS.items():
+            invalid = state.lengths[column]
+            if invalid['count']:
+                validation_results['length_constraints'][column] = {
                     'status': 'Fail',
-                    'reason': 'Duplicate values found'
+                    'reason': f'Length constraints not met: should be between {min_length} and {max_length} characters',
+                    'count': invalid['count'],
+                    'samples': invalid['samples']
                 }
                 validation_results['status'] = 'Fail'
             else:
-                validation_results['unique_constraints']['course_id'] = {'status': 'Pass'}
-
-            # 4. Check length constraints (if applicable)
-            length_constraints = {
-                'Title': (1, 100),
-                'Instructor': (1, 50),
-                'Keywords': (1, 1000),
-                'Learn': (1, 2000),
-                'Description': (1, 2000)
-            }
-            for column, (min_length, max_length) in length_constraints.items():
-                invalid_length = df[column].apply(lambda x: not (min_length <= len(str(x)) <= max_length))
-                if invalid_length.any():
-                    validation_results['length_constraints'][column] = {
-                        'status': 'Fail',
-                        'reason': f'Length constraints not met: should be between {min_length} and {max_length} characters'
-                    }
-                    validation_results['status'] = 'Fail'
-                else:
-                    validation_results['length_constraints'][column] = {'status': 'Pass'}
-
-            return validation_results
+                validation_results['length_constraints'][column] = {'status': 'Pass'}
+
+        return validation_results
+
+    def validate_chunks(self, chunks):
+        """
+        Validates course data chunk by chunk, so memory is bounded by the chunk
+        size apart from the course ids kept for the uniqueness check.
+
+        Args:
+            chunks (Iterable[pd.DataFrame]): Consecutive chunks of the course data.
+
+        Returns:
+            dict: Validation results with pass/fail status and reasons for failure.
+        """
+        try:
+            state = ValidationState(self.artifact.max_samples)
+            with ThreadPoolExecutor(max_workers=self.artifact.max_workers) as executor:
+                for chunk in chunks:
+                    self.validate_chunk(chunk, state, executor)
+            return self.build_report(state)
         except Exception as e:
             logger.exception(f"Error occurred in Data Validation: {e}")
             raise CustomException(e, sys)
 
+    def validate_data(self, df):
+        """
+        Validate the data in the given DataFrame.
+
+        Args:
+            df (pd.DataFrame): The DataFrame to validate.
+
+        Returns:
+            dict: Validation results with pass/fail status and reasons for failure.
+        """
+        return self.validate_chunks([df])
+
     def initiate_data_validation(self):
         try:
-            df = pd.read_csv(self.input.course_filepath)
-            results = self.validate_data(df)
+            chunks = pd.read_csv(self.input.course_filepath, chunksize=self.artifact.chunk_size)
+            results = self.validate_chunks(chunks)
             # Write results to YAML file
             with open(self.artifact.report_filepath, 'w') as file:
                 yaml.dump(results, file, default_flow_style=False)
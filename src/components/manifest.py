@@ -0,0 +1,86 @@
+from src.logger import logger
+from src.exception import CustomException
+from src.config.manifest import ManifestArtifact
+from dataclasses import asdict, is_dataclass
+import hashlib
+import json
+import yaml
+import sys
+import os
+
+
+class Manifest:
+    """
+    Records a fingerprint of the inputs and configuration of every training
+    stage, so a stage can be skipped when none of them changed.
+
+    File hashes are cached together with the file's size and modification
+    time, so unchanged files are not re-read on every run.
+    """
+
+    def __init__(self, artifact_config=None):
+        self.artifact = artifact_config if artifact_config is not None else ManifestArtifact()
+        self.stages = {}
+        self.files = {}
+        if os.path.exists(self.artifact.filepath):
+            with open(self.artifact.filepath) as file:
+                manifest = yaml.safe_load(file) or {}
+            self.stages = manifest.get('stages', {})
+            self.files = manifest.get('files', {})
+
+    def file_hash(self, filepath):
+        """
+        Returns:
+            str: SHA-256 of the file contents, or None when the file is missing.
+        """
+        if not os.path.exists(filepath):
+            return None
+        info = os.stat(filepath)
+        cached = self.files.get(filepath)
+        if cached and cached['size'] == info.st_size and cached['mtime_ns'] == info.st_mtime_ns:
+            return cached['sha256']
+
+        digest = hashlib.sha256()
+        with open(filepath, 'rb') as file:
+            for block in iter(lambda: file.read(self.artifact.block_size), b''):
+                digest.update(block)
+        self.files[filepath] = {'size': info.st_size, 'mtime_ns': info.st_mtime_ns, 'sha256': digest.hexdigest()}
+        return digest.hexdigest()
+
+    def fingerprint(self, inputs, config):
+        """
+        Fingerprints a stage from its input files and configuration.
+
+        Args:
+            inputs (list): Input file paths.
+            config (dict): Configuration values; dataclass instances are expanded.
+
+        Returns:
+            str: SHA-256 over the input hashes and the configuration.
+        """
+        config = {name: asdict(value) if is_dataclass(value) else value for name, value in config.items()}
+        payload = {
+            'inputs': {filepath: self.file_hash(filepath) for filepath in inputs},
+            'config': config,
+        }
+        return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+
+    def is_current(self, stage, fingerprint, outputs):
+        """
+        Returns:
+            bool: True if the stage last ran with this fingerprint and all of its
+            outputs still exist.
+        """
+        return self.stages.get(stage) == fingerprint and all(os.path.exists(output) for output in outputs)
+
+    def record(self, stage, fingerprint):
+        """
+        Stores a stage's fingerprint after it completed and saves the manifest.
+        """
+        try:
+            self.stages[stage] = fingerprint
+            with open(self.artifact.filepath, 'w') as file:
+                yaml.dump({'stages': self.stages, 'files': self.files}, file, default_flow_style=False)
+        except Exception as e:
+            logger.exception(f"Error occurred while writing manifest: {e}")
+            raise CustomException(e, sys)
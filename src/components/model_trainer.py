@@ -0,0 +1,272 @@
+from src.logger import logger
+from src.metrics import metrics, ROWS_HELP
+from src.exception import CustomException
+from src.config.model_trainer import ModelTrainerArtifact, ModelTrainerInput
+from datetime import datetime
+import pandas as pd
+import numpy as np
+from scipy.sparse import csr_matrix
+import sys
+import os
+
+RATING_KEYS = ['user_id', 'course_id']
+
+
+def get_rating_entries(ratings):
+    """
+    Args:
+        ratings (pd.DataFrame): DataFrame with 'user_id', 'course_id' and 'rating' columns.
+
+    Returns:
+        pd.DataFrame: One row per (user_id, course_id), with duplicate ratings summed
+        as they are in the sparse rating matrix.
+    """
+    return ratings.groupby(RATING_KEYS, as_index=False, sort=False)['rating'].sum()
+
+
+class ModelTrainer:
+    def __init__(self, input_config=None, artifact_config=None):
+        self.input = input_config if input_config is not None else ModelTrainerInput()
+        self.artifact = artifact_config if artifact_config is not None else ModelTrainerArtifact()
+
+    def factorize(self, ratings):
+        """
+        Factorizes the user-item rating matrix with a truncated SVD.
+
+        Args:
+            ratings (pd.DataFrame): DataFrame with 'user_id', 'course_id' and 'rating' columns.
+
+        Returns:
+            dict: User factors (U·Σ), item factors (Vᵀ transposed), singular values and
+            the sorted user and course ids that map ids to factor rows.
+        """
+        try:
+            # Imported here so that serving, which only loads saved factors, does not pay for it
+            from scipy.sparse.linalg import svds
+
+            logger.info("Building sparse user-item rating matrix.")
+            user_ids, user_rows = np.unique(ratings['user_id'].to_numpy(), return_inverse=True)
+            course_ids, course_cols = np.unique(ratings['course_id'].to_numpy(), return_inverse=True)
+            user_item_matrix = csr_matrix(
+                (ratings['rating'].to_numpy(dtype=np.float64), (user_rows, course_cols)),
+                shape=(len(user_ids), len(course_ids))
+            )
+
+            k = min(self.artifact.n_factors, min(user_item_matrix.shape) - 1)
+            logger.info(f"Running truncated SVD with k={k} on a {user_item_matrix.shape} matrix.")
+            U, sigma, Vt = svds(user_item_matrix, k=k)
+
+            return {
+                'user_factors': U * sigma,
+                'item_factors': Vt.T,
+                'sigma': sigma,
+                'user_ids': user_ids,
+                'course_ids': course_ids,
+                'n_ratings': len(ratings),
+                'fold_ins': 0,
+            }
+        except Exception as e:
+            logger.exception(f"Error occurred during SVD factorization: {e}")
+            raise CustomException(e, sys)
+
+    def fold_in(self, model, rating_changes, n_ratings):
+        """
+        Folds rating changes into an existing factor model without refactorizing.
+
+        User factors are linear in the rating row (U·Σ = R·V), so every affected
+        user gains ΔR·V; new users are projected the same way. ΔR holds the
+        difference to the ratings the model was built from: the full value of a
+        new rating, new minus old for an edited one and minus old for a removed
+        one. New courses are projected onto the user factors as
+        Vᵀ = Σ⁻²·(U·Σ)ᵀ·ΔR. Item factors of existing courses stay fixed until the
+        next full rebuild.
+
+        Args:
+            model (dict): Factor model as returned by `factorize`.
+            rating_changes (pd.DataFrame): Rating differences, as returned by `get_rating_changes`.
+            n_ratings (int): Number of ratings the updated model covers.
+
+        Returns:
+            dict: The updated factor model.
+        """
+        try:
+            user_ids = np.union1d(model['user_ids'], rating_changes['user_id'].to_numpy())
+            course_ids = np.union1d(model['course_ids'], rating_changes['course_id'].to_numpy())
+            old_user_rows = np.searchsorted(user_ids, model['user_ids'])
+            old_course_rows = np.searchsorted(course_ids, model['course_ids'])
+            logger.info(f"Folding in {len(rating_changes)} rating changes: {len(user_ids) - len(model['user_ids'])} new users, "
+                        f"{len(course_ids) - len(model['course_ids'])} new courses.")
+
+            k = len(model['sigma'])
+            user_factors = np.zeros((len(user_ids), k))
+            user_factors[old_user_rows] = model['user_factors']
+            item_factors = np.zeros((len(course_ids), k))
+            item_factors[old_course_rows] = model['item_factors']
+
+            delta = csr_matrix(
+                (rating_changes['rating'].to_numpy(dtype=np.float64),
+                 (np.searchsorted(user_ids, rating_changes['user_id'].to_numpy()),
+                  np.searchsorted(course_ids, rating_changes['course_id'].to_numpy()))),
+                shape=(len(user_ids), len(course_ids))
+            )
+            user_factors += delta @ item_factors
+
+            new_courses = np.setdiff1d(np.arange(len(course_ids)), old_course_rows)
+            item_factors[new_courses] = (delta[:, new_courses].T @ user_factors) / model['sigma'] ** 2
+
+            return {
+                'user_factors': user_factors,
+                'item_factors': item_factors,
+                'sigma': model['sigma'],
+                'user_ids': user_ids,
+                'course_ids': course_ids,
+                'n_ratings': n_ratings,
+                'fold_ins': int(model['fold_ins']) + 1,
+            }
+        except Exception as e:
+            logger.exception(f"Error occurred while folding in new ratings: {e}")
+            raise CustomException(e, sys)
+
+    def load_previous_model(self):
+        """
+        Returns:
+            dict: The saved factor model, or None when it is missing or was written
+            in an older format that cannot be updated incrementally.
+        """
+        if not os.path.exists(self.artifact.model_filepath):
+            return None
+        model = load_model(self.artifact.model_filepath)
+        if int(model['format_version']) != self.artifact.format_version:
+            logger.info("Saved SVD model has an older format; a full rebuild is required.")
+            return None
+        return model
+
+    def get_rating_changes(self, model, ratings):
+        """
+        Compares the current ratings with those the saved model was built from,
+        by content rather than by file position, so edited ratings that the
+        ingestion merge moved and files reordered by a full refresh are handled.
+
+        Args:
+            model (dict): The saved factor model.
+            ratings (pd.DataFrame): Current ratings.
+
+        Returns:
+            pd.DataFrame: Rating difference of every new, edited or removed
+            (user_id, course_id), or None when the stored ratings do not belong
+            to the saved model.
+        """
+        if not os.path.exists(self.artifact.state_filepath):
+            return None
+        with np.load(self.artifact.state_filepath) as state:
+            if str(state['version']) != model['version']:
+                logger.info("Stored ratings belong to another SVD model; a full rebuild is required.")
+                return None
+            consumed = pd.DataFrame({
+                'user_id': state['user_ids'],
+                'course_id': state['course_ids'],
+                'consumed_rating': state['ratings'],
+            })
+        merged = get_rating_entries(ratings).merge(consumed, on=RATING_KEYS, how='outer')
+        difference = merged['rating'].fillna(0).to_numpy() - merged['consumed_rating'].fillna(0).to_numpy()
+        changed = difference != 0
+        return merged.loc[changed, RATING_KEYS].assign(rating=difference[changed]).reset_index(drop=True)
+
+    def save_state(self, ratings, version):
+        """
+        Saves the ratings a model was built from, for `get_rating_changes`.
+
+        Args:
+            ratings (pd.DataFrame): Ratings the model covers.
+            version (str): Version identifier of the model.
+        """
+        try:
+            entries = get_rating_entries(ratings)
+            np.savez(
+                self.artifact.state_filepath,
+                version=version,
+                user_ids=entries['user_id'].to_numpy(),
+                course_ids=entries['course_id'].to_numpy(),
+                ratings=entries['rating'].to_numpy(dtype=np.float64),
+            )
+            logger.info(f"SVD rating state saved to {self.artifact.state_filepath} successfully!")
+        except Exception as e:
+            logger.exception(f"Error occurred while saving SVD rating state: {e}")
+            raise CustomException(e, sys)
+
+    def save_model(self, model, version):
+        """
+        Saves the factor model together with its id-to-row maps and version.
+
+        Args:
+            model (dict): Output of `factorize`.
+            version (str): Version identifier of this model.
+        """
+        try:
+            np.savez(
+                self.artifact.model_filepath,
+                format_version=self.artifact.format_version,
+                version=version,
+                **model
+            )
+            logger.info(f"SVD model {version} saved to {self.artifact.model_filepath} successfully!")
+        except Exception as e:
+            logger.exception(f"Error occurred while saving SVD model: {e}")
+            raise CustomException(e, sys)
+
+    def initiate_model_training(self, incremental=False):
+        """
+        Factorizes the ratings once and persists the user and item factors so that
+        serving only needs a single user-factor × item-factor product.
+
+        Args:
+            incremental (bool): Fold the ratings that were added, edited or removed
+                since the saved model into it. A full rebuild still runs every
+                `full_rebuild_every` fold-ins or when the changes exceed
+                `max_fold_in_fraction` of the ratings already in the model.
+        """
+        try:
+            logger.info("Initiating model training process.")
+            ratings = pd.read_csv(self.input.ratings_filepath)
+            logger.info(f"Ratings loaded successfully from {self.input.ratings_filepath}.")
+            model = self.load_previous_model() if incremental else None
+            if model is not None and int(model['fold_ins']) < self.artifact.full_rebuild_every:
+                rating_changes = self.get_rating_changes(model, ratings)
+                if rating_changes is None:
+                    model = None
+                elif rating_changes.empty:
+                    logger.info("No rating changes since the last model; keeping it unchanged.")
+                    return
+                elif len(rating_changes) <= self.artifact.max_fold_in_fraction * int(model['n_ratings']):
+                    model = self.fold_in(model, rating_changes, len(get_rating_entries(ratings)))
+                else:
+                    model = None
+            else:
+                model = None
+
+            if model is None:
+                logger.info("Running a full SVD rebuild.")
+                model = self.factorize(ratings)
+            version = datetime.now().strftime("%Y%m%d%H%M%S")
+            self.save_model(model, version)
+            self.save_state(ratings, version)
+            metrics.set_gauge('dataset_rows', int(model['n_ratings']), ROWS_HELP, table='ratings')
+        except Exception as e:
+            logger.exception(f"Error occurred during model training: {e}")
+            raise CustomException(e, sys)
+
+
+def load_model(filepath):
+    """
+    Loads a factor model saved by `ModelTrainer.save_model`.
+
+    Args:
+        filepath (str): Path to the saved model.
+
+    Returns:
+        dict: The stored arrays, with 'version' as a plain string.
+    """
+    with np.load(filepath) as data:
+        model = {key: data[key] for key in data.files}
+    model['version'] = str(model['version'])
+    return model
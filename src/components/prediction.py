@@ -1,116 +1,772 @@
 from src.logger import logger
+from src.metrics import metrics, ROWS_HELP
 from src.exception import CustomException
 from src.config.prediction import PredictionInput
+from src.components.model_trainer import ModelTrainer, load_model
+from src.components.ann_index import IVFIndex, to_dense, normalize_rows
+from src.components.artifact_bundle import ArtifactBundle
+from src.components.similarity_graph import SimilarityGraph
+from src.components.context_index import ContextIndex
 import pandas as pd
-from sklearn.metrics.pairwise import cosine_similarity
-import joblib
 import sys
 import numpy as np
-from scipy.sparse.linalg import svds
-from scipy.sparse import csr_matrix
-from scipy.sparse import load_npz
+import os
+from scipy.sparse import load_npz, csr_matrix, issparse
+
+
+DEFAULT_WEIGHTS = {
+    'svd': 0.4,
+    'context': 0.3,
+    'content': 0.3
+}
+
+RECOMMENDER_HELP = "Duration of one recommender call."
+COMPONENT_HELP = "Duration of scoring one hybrid signal."
+MEMORY_HELP = "Bytes held in memory by a loaded prediction component."
+
+
+def lookup_rows(ids, order, values):
+    """
+    Maps each value to its row position in `ids`.
+
+    Args:
+        ids (np.ndarray): Ids in row order.
+        order (np.ndarray): Permutation that sorts `ids`.
+        values (np.ndarray): Ids to look up.
+
+    Returns:
+        np.ndarray: Row position of every value, or -1 where the id is absent.
+    """
+    values = np.asarray(values)
+    if len(ids) == 0:
+        return np.full(values.shape, -1, dtype=np.int64)
+    sorted_ids = ids[order]
+    positions = np.clip(np.searchsorted(sorted_ids, values), 0, len(ids) - 1)
+    return np.where(sorted_ids[positions] == values, order[positions], -1)
+
+
+class IdIndex:
+    """
+    Maps ids to row positions in O(1) through a dense id → row array.
+
+    Ids that are not small non-negative integers, or too sparse for a dense
+    array of at most `max_density` entries per id, fall back to a binary
+    search over the sorted ids. When an id repeats, its first row wins.
+    """
+
+    def __init__(self, ids, max_density=4):
+        ids = np.asarray(ids)
+        self.positions = None
+        if (len(ids) and np.issubdtype(ids.dtype, np.integer) and ids.min() >= 0
+                and ids.max() < max(max_density * len(ids), 1024)):
+            self.positions = np.full(int(ids.max()) + 1, -1, dtype=np.int64)
+            self.positions[ids[::-1]] = np.arange(len(ids) - 1, -1, -1)
+        else:
+            self.ids = ids
+            self.order = np.argsort(ids, kind='stable')
+
+    def rows(self, values):
+        """
+        Args:
+            values (np.ndarray): Ids to look up.
+
+        Returns:
+            np.ndarray: Row position of every id, or -1 where the id is absent.
+        """
+        values = np.asarray(values)
+        if self.positions is None:
+            return lookup_rows(self.ids, self.order, values)
+        rows = np.full(values.shape, -1, dtype=np.int64)
+        if not np.issubdtype(values.dtype, np.integer):
+            valid = np.isfinite(values)
+            ids = np.where(valid, values, -1).astype(np.int64)
+            valid &= ids == values
+        else:
+            ids = values.astype(np.int64, copy=False)
+            valid = np.ones(values.shape, dtype=bool)
+        valid &= (ids >= 0) & (ids < len(self.positions))
+        rows[valid] = self.positions[ids[valid]]
+        return rows
+
+    def row(self, value):
+        """
+        Returns:
+            int: Row position of one id, or -1 when it is absent.
+        """
+        if self.positions is not None and isinstance(value, (int, np.integer)):
+            return int(self.positions[value]) if 0 <= value < len(self.positions) else -1
+        return int(self.rows(np.array([value]))[0])
+
+
+def is_mapped(array):
+    """
+    Returns:
+        bool: True if the array is a view of a memory-mapped file.
+    """
+    while isinstance(array, np.ndarray):
+        if isinstance(array, np.memmap):
+            return True
+        array = array.base
+    return False
+
+
+def nbytes(*objects):
+    """
+    Sums the memory held by arrays, sparse matrices, data frames and dicts or
+    lists of them. Memory-mapped arrays live in the page cache shared by all
+    workers and are not counted.
+
+    Returns:
+        int: Number of bytes.
+    """
+    total = 0
+    for obj in objects:
+        if isinstance(obj, dict):
+            total += nbytes(*obj.values())
+        elif isinstance(obj, (list, tuple)):
+            total += nbytes(*obj)
+        elif issparse(obj):
+            total += nbytes(obj.data, obj.indices, obj.indptr)
+        elif isinstance(obj, pd.DataFrame):
+            total += int(obj.memory_usage(index=False, deep=True).sum())
+        elif isinstance(obj, np.ndarray) and not is_mapped(obj):
+            total += obj.nbytes
+    return total
+
+
+def downcast(df):
+    """
+    Returns:
+        pd.DataFrame: The frame with every numeric column in the smallest
+        integer or float32 type that holds its values.
+    """
+    df = df.copy()
+    for column in df.select_dtypes('integer'):
+        df[column] = pd.to_numeric(df[column], downcast='integer')
+    for column in df.select_dtypes('floating'):
+        df[column] = pd.to_numeric(df[column], downcast='float')
+    return df
+
+
+def top_n_columns(scores, top_n):
+    """
+    Selects the column indices of the `top_n` highest scores in every row.
+
+    Args:
+        scores (np.ndarray): 2D score matrix.
+        top_n (int): Number of columns to select per row.
+
+    Returns:
+        np.ndarray: Column indices ordered from highest to lowest score.
+    """
+    top_n = min(top_n, scores.shape[1])
+    if top_n <= 0:
+        return np.empty((scores.shape[0], 0), dtype=np.int64)
+    top = np.argpartition(-scores, top_n - 1, axis=1)[:, :top_n]
+    order = np.argsort(-np.take_along_axis(scores, top, axis=1), axis=1, kind='stable')
+    return np.take_along_axis(top, order, axis=1)
+
+
+def normalize_scores(scores):
+    """
+    Min-max scales every row of a score matrix to [0, 1].
+
+    Args:
+        scores (np.ndarray): 2D score matrix; -inf marks courses without a score.
+
+    Returns:
+        np.ndarray: Scaled scores, with 0 wherever the input was not finite.
+    """
+    finite = np.isfinite(scores)
+    low = np.where(finite, scores, np.inf).min(axis=1, keepdims=True)
+    high = np.where(finite, scores, -np.inf).max(axis=1, keepdims=True)
+    span = high - low
+    with np.errstate(invalid='ignore'):
+        scaled = (scores - low) / np.where(span > 0, span, 1.0)
+    return np.where(finite, scaled, 0.0)
+
 
 class Prediction:
-    def __init__(self):
-        self.input = PredictionInput()
+    def __init__(self, input_config=None):
+        self.input = input_config if input_config is not None else PredictionInput()
+        # Value type of the TF-IDF matrix, factors and score matrices
+        self.dtype = np.float32 if self.input.low_memory else np.float64
 
+    @metrics.timed('artifact_load_seconds', "Duration of loading the prediction artifacts.")
     def load_input_data(self):
         try:
-            self.courses = pd.read_csv(self.input.course_filepath)
             self.users = pd.read_csv(self.input.users_filepath)
             self.ratings = pd.read_csv(self.input.ratings_filepath)
-            self.vectorizer = joblib.load(self.input.vectorizer_filepath)
-            self.vectors = load_npz(self.input.tf_idf_filepath)
+            if self.input.low_memory:
+                self.users, self.ratings = downcast(self.users), downcast(self.ratings)
+            if os.path.exists(self.input.bundle_dirpath):
+                self.bundle = ArtifactBundle(self.input.bundle_dirpath)
+                self.courses = None
+                self.course_ids = self.bundle.course_ids
+                self.vectorizer = self.bundle.vectorizer
+                self.vectors = self.bundle.vectors
+                logger.info(f"Memory-mapped artifact bundle opened from {self.input.bundle_dirpath}.")
+            else:
+                self.bundle = None
+                self.courses = pd.read_csv(self.input.course_filepath)
+                self.course_ids = self.courses['course_id'].to_numpy()
+                # Unpickling the vectorizer imports scikit-learn; the bundle path avoids both
+                import joblib
+                self.vectorizer = joblib.load(self.input.vectorizer_filepath)
+                self.vectors = load_npz(self.input.tf_idf_filepath)
+            self.tfidf_fingerprint = self.load_tfidf_fingerprint()
+            # A memory-mapped bundle is already shared between workers; copying it would not save memory
+            if self.vectors.dtype != self.dtype and not is_mapped(self.vectors.data):
+                self.vectors = self.vectors.astype(self.dtype)
+            self.load_svd_model()
+            self.load_ann_index()
+            self.load_similarity_graph()
+            self.build_index()
+            self.load_context_index()
+            self.record_artifact_metrics()
+            self.record_memory_metrics()
             logger.info("Data and vectorizer loaded successfully.")
         except Exception as e:
             logger.error(f"Error loading input data: {e}")
             raise CustomException(e, sys)
 
+    def user_digests(self):
+        """
+        Hashes every user's profile and ratings so that a reload can tell which
+        users changed.
+
+        Returns:
+            pd.Series: uint64 digest per user, indexed by user id.
+        """
+        rating_hashes = pd.util.hash_pandas_object(self.ratings[['user_id', 'course_id', 'rating']], index=False)
+        rating_digests = rating_hashes.groupby(self.ratings['user_id'].to_numpy()).sum()
+        profile_digests = pd.Series(
+            pd.util.hash_pandas_object(self.users[['role', 'goal']], index=False).to_numpy(),
+            index=self.users['user_id'].to_numpy()
+        )
+        profile_digests = profile_digests[~profile_digests.index.duplicated(keep='last')]
+        index = rating_digests.index.union(profile_digests.index)
+        digests = (rating_digests.reindex(index, fill_value=0).to_numpy(dtype=np.uint64)
+                   ^ profile_digests.reindex(index, fill_value=0).to_numpy(dtype=np.uint64))
+        return pd.Series(digests, index=index)
+
+    def record_artifact_metrics(self):
+        """
+        Exports the row counts of the loaded tables and the size of every artifact file.
+        """
+        metrics.set_gauge('dataset_rows', len(self.course_ids), ROWS_HELP, table='courses')
+        metrics.set_gauge('dataset_rows', len(self.users), ROWS_HELP, table='users')
+        metrics.set_gauge('dataset_rows', len(self.ratings), ROWS_HELP, table='ratings')
+        metrics.record_file_sizes({
+            'courses': self.input.course_filepath,
+            'users': self.input.users_filepath,
+            'ratings': self.input.ratings_filepath,
+            'tf_idf': self.input.tf_idf_filepath,
+            'vectorizer': self.input.vectorizer_filepath,
+            'svd_model': self.input.svd_model_filepath,
+            'ann_index': self.input.ann_index_filepath,
+            'similarity_graph': self.input.similarity_graph_filepath,
+            'context_index': self.input.context_index_filepath,
+            'top_n': self.input.top_n_filepath,
+            'bundle': self.input.bundle_dirpath,
+        })
+
+    def load_tfidf_fingerprint(self):
+        """
+        Returns:
+            str: Fingerprint of the TF-IDF matrix and vectorizer recorded at
+            training time, or '' when the artifacts predate it.
+        """
+        if self.bundle is not None:
+            return self.bundle.meta.get('fingerprint', '')
+        if not os.path.exists(self.input.tfidf_state_filepath):
+            return ''
+        with np.load(self.input.tfidf_state_filepath) as state:
+            return str(state['fingerprint']) if 'fingerprint' in state.files else ''
+
+    def memory_report(self):
+        """
+        Measures the memory held by every loaded component.
+
+        Returns:
+            dict: Bytes per component. Memory-mapped bundle arrays are not counted.
+        """
+        report = {
+            'courses': nbytes(self.courses),
+            'users': nbytes(self.users),
+            'ratings': nbytes(self.ratings),
+            'tf_idf': nbytes(self.vectors),
+            'svd_model': nbytes(self.svd_model),
+            'ann_index': nbytes(vars(self.ann_index)) if self.ann_index is not None else 0,
+            'similarity_graph': nbytes(self.graph_adjacency) + (
+                nbytes(vars(self.similarity_graph)) if self.similarity_graph is not None else 0
+            ),
+            'context_index': self.context_index.nbytes,
+            'id_index': nbytes(
+                vars(self.course_index), vars(self.user_index), vars(self.rating_user_index),
+                vars(self.svd_user_index), self.user_ids, self.rating_user_ids, self.svd_columns,
+            ),
+            'ratings_index': nbytes(self.user_ratings, self.rated_matrix),
+        }
+        # The context strings are Python objects; count the string payloads as well
+        report['id_index'] += int(pd.Series(self.user_context_strings).memory_usage(index=False, deep=True))
+        return report
+
+    def record_memory_metrics(self):
+        """
+        Logs the memory held by every loaded component and exports it as gauges.
+        """
+        report = self.memory_report()
+        for component, size in report.items():
+            metrics.set_gauge('memory_bytes', size, MEMORY_HELP, component=component)
+        summary = ", ".join(f"{component}={size / 2 ** 20:.1f}MiB" for component, size in report.items())
+        logger.info(f"Prediction memory ({np.dtype(self.dtype).name}): {sum(report.values()) / 2 ** 20:.1f}MiB total; {summary}")
+
+    def load_svd_model(self):
+        """
+        Loads the SVD factor model written at training time. Falls back to
+        factorizing the loaded ratings when no model artifact exists yet.
+        """
+        try:
+            if os.path.exists(self.input.svd_model_filepath):
+                self.svd_model = load_model(self.input.svd_model_filepath)
+                logger.info(f"SVD model {self.svd_model['version']} loaded successfully.")
+            else:
+                logger.warning(f"No SVD model found at {self.input.svd_model_filepath}; factorizing ratings in memory.")
+                self.svd_model = ModelTrainer().factorize(self.ratings)
+                self.svd_model['version'] = 'in-memory'
+            for name in ('user_factors', 'item_factors'):
+                self.svd_model[name] = self.svd_model[name].astype(self.dtype, copy=False)
+        except Exception as e:
+            logger.error(f"Error loading SVD model: {e}")
+            raise CustomException(e, sys)
+
+    def load_ann_index(self):
+        """
+        Loads the approximate nearest-neighbour index for large catalogs. Small
+        catalogs, or a missing index, use exact similarity scans.
+        """
+        try:
+            self.ann_index = None
+            if self.vectors.shape[0] < self.input.ann_min_courses:
+                logger.info("Catalog below ANN threshold; using exact similarity search.")
+            elif os.path.exists(self.input.ann_index_filepath):
+                self.ann_index = IVFIndex.load(self.input.ann_index_filepath)
+                logger.info(f"ANN index with {self.ann_index.n_clusters} clusters loaded successfully.")
+            else:
+                logger.warning(f"No ANN index found at {self.input.ann_index_filepath}; using exact similarity search.")
+        except Exception as e:
+            logger.error(f"Error loading ANN index: {e}")
+            raise CustomException(e, sys)
+
+    def load_similarity_graph(self):
+        """
+        Loads the course nearest-neighbour graph written at training time. Without
+        it, related courses and the content signal fall back to catalog scans.
+        """
+        try:
+            self.similarity_graph = None
+            self.graph_adjacency = None
+            if os.path.exists(self.input.similarity_graph_filepath):
+                graph = SimilarityGraph.load(self.input.similarity_graph_filepath)
+                if graph.n_courses == len(self.course_ids):
+                    self.similarity_graph = graph
+                    self.graph_adjacency = graph.adjacency(self_loops=True, dtype=self.dtype)
+                    logger.info(f"Top-{graph.k} similarity graph loaded successfully.")
+                else:
+                    logger.warning("Similarity graph does not match the course catalog; ignoring it.")
+        except Exception as e:
+            logger.error(f"Error loading similarity graph: {e}")
+            raise CustomException(e, sys)
+
+    def load_context_index(self):
+        """
+        Loads the per-(role, goal) context scores precomputed at training time.
+        Without them, each distinct context is scored on first use.
+        """
+        try:
+            if os.path.exists(self.input.context_index_filepath):
+                self.context_index = ContextIndex.load(
+                    self.input.context_index_filepath, np.asarray(self.course_ids), self.score_contexts,
+                    self.dtype, self.tfidf_fingerprint
+                )
+                logger.info(f"Context index with {len(self.context_index)} contexts loaded successfully.")
+            else:
+                self.context_index = ContextIndex(
+                    np.asarray(self.course_ids), self.score_contexts, fingerprint=self.tfidf_fingerprint
+                )
+        except Exception as e:
+            logger.error(f"Error loading context index: {e}")
+            raise CustomException(e, sys)
+
+    def score_contexts(self, contexts):
+        """
+        Args:
+            contexts (list): Context strings of role and goal.
+
+        Returns:
+            np.ndarray: Cosine similarities of every context with all courses.
+        """
+        return self.similarity_scores(self.vectorizer.transform(contexts)).astype(self.dtype, copy=False)
+
+    def user_contexts(self, user_rows):
+        """
+        Returns:
+            list: The role and goal context string of the given users table rows.
+        """
+        return self.user_context_strings[user_rows].tolist()
+
+    def similarity_scores(self, queries, n_probe=None):
+        """
+        Computes cosine similarities between L2-normalized queries and all courses,
+        through the ANN index when one is loaded.
+
+        Args:
+            queries: Sparse or dense L2-normalized query matrix.
+            n_probe (int, optional): Clusters probed per query. Defaults to the
+                configured value; probing every cluster gives an exact scan.
+
+        Returns:
+            np.ndarray: Similarities of shape (number of queries, number of courses);
+            courses skipped by the ANN index are -inf.
+        """
+        if n_probe is None:
+            n_probe = self.input.ann_n_probe
+        if self.ann_index is None or n_probe >= self.ann_index.n_clusters:
+            return to_dense(queries @ self.vectors.T)
+        return self.ann_index.search_scores(queries, self.vectors, n_probe)
+
+    def build_index(self):
+        """
+        Builds the index layer of the hot path: dense id → row arrays for users,
+        rating users, SVD users and courses, and a CSR user → (course, rating)
+        matrix, so per-request lookups cost O(ratings of that user) and hold
+        for sparse or unordered ids.
+        """
+        try:
+            self.course_index = IdIndex(self.course_ids)
+            self.user_ids = self.users['user_id'].to_numpy()
+            self.user_index = IdIndex(self.user_ids)
+            self.user_context_strings = (self.users['role'] + " " + self.users['goal']).to_numpy(dtype=object)
+
+            # CSR user → (course, rating) index; a repeated rating of a course keeps the last one
+            ratings = self.ratings.drop_duplicates(subset=['user_id', 'course_id'], keep='last')
+            self.rating_user_ids, rating_rows = np.unique(ratings['user_id'].to_numpy(), return_inverse=True)
+            self.rating_user_index = IdIndex(self.rating_user_ids)
+            rating_cols = self.course_index.rows(ratings['course_id'].to_numpy())
+            known = rating_cols >= 0
+            self.user_ratings = csr_matrix(
+                (ratings['rating'].to_numpy(dtype=self.dtype)[known], (rating_rows[known], rating_cols[known])),
+                shape=(len(self.rating_user_ids), len(self.course_ids))
+            )
+            self.user_ratings.sort_indices()
+            self.rated_matrix = self.user_ratings.copy()
+            self.rated_matrix.data[:] = 1.0
+
+            self.svd_user_index = IdIndex(self.svd_model['user_ids'])
+            self.svd_columns = self.course_index.rows(self.svd_model['course_ids'])
+            logger.info("Prediction index built successfully.")
+        except Exception as e:
+            logger.error(f"Error building prediction index: {e}")
+            raise CustomException(e, sys)
+
+    def get_courses(self, rows):
+        """
+        Returns the course details of the given catalog rows.
+
+        Args:
+            rows (np.ndarray): Course row positions.
+
+        Returns:
+            pd.DataFrame: Course details in the order of `rows`.
+        """
+        if self.bundle is not None:
+            return self.bundle.course_frame(rows)
+        return self.courses.iloc[rows]
+
+    @metrics.timed('recommender_seconds', RECOMMENDER_HELP, recommender='context')
     def match_courses_with_context(self, user_id, top_n=3):
         try:
-            user_context_str = self.users.loc[user_id, 'role'] + " " + self.users.loc[user_id, 'goal']
-            user_context_vector = self.vectorizer.transform([user_context_str])
-            cosine_similarities = cosine_similarity(user_context_vector, self.vectors).flatten()
-            top_n_indices = cosine_similarities.argsort()[-top_n:][::-1]
-            context_recommendations = self.courses.iloc[top_n_indices]
-            return context_recommendations['course_id'].tolist()
+            user_row = self.user_index.row(user_id)
+            if user_row < 0:
+                logger.info(f"User {user_id} is not in the users table.")
+                return []
+            user_context_str = self.user_context_strings[user_row]
+            top_n_indices = self.context_index.ranking(user_context_str, top_n, top_n_columns)
+            return self.course_ids[top_n_indices].tolist()
         except Exception as e:
             logger.error(f"Error in context-based recommendation for user {user_id}: {e}")
             raise CustomException(e, sys)
 
+    @metrics.timed('recommender_seconds', RECOMMENDER_HELP, recommender='content')
     def content_based_recommendations(self, user_id, top_n=3):
         try:
-            # Get the courses the user has already rated
-            user_ratings = self.ratings[self.ratings['user_id'] == user_id]
-            rated_courses = user_ratings['course_id'].tolist()
-
-            # Vectorize the descriptions of these courses
-            user_profile_vector = self.vectors[self.courses['course_id'].isin(rated_courses)].mean(axis=0)
-            # Ensure user_profile_vector is 2D
-            # Ensure user_profile_vector is a numpy array (not a matrix)
-            if isinstance(user_profile_vector, np.matrix):
-                user_profile_vector = np.asarray(user_profile_vector)
-            if user_profile_vector.ndim == 1:
-                user_profile_vector = user_profile_vector.reshape(1, -1)
-            # Ensure self.vectors is also a numpy array (not a matrix)
-            if isinstance(self.vectors, np.matrix):
-                self.vectors = np.asarray(self.vectors) 
+            rating_row = self.rating_user_index.row(user_id)
+            if rating_row < 0:
+                logger.info(f"User {user_id} has no ratings.")
+                return []
+            if self.use_graph_content():
+                cosine_similarities = self.graph_content_scores(np.array([rating_row]))
+                top_n_indices = top_n_columns(cosine_similarities, top_n)[0]
+                top_n_indices = top_n_indices[np.isfinite(cosine_similarities[0, top_n_indices])]
+                return self.course_ids[top_n_indices].tolist()
+
+            # Sum the vectors of the courses the user has already rated as a sparse row;
+            # the L2 normalisation makes it equal to the normalized mean profile
+            user_profile_vector = normalize_rows(self.rated_matrix[rating_row] @ self.vectors)
 
             # Compute cosine similarities between the user profile vector and all course vectors
-            cosine_similarities = cosine_similarity(user_profile_vector, self.vectors).flatten()
-            top_n_indices = cosine_similarities.argsort()[-top_n:][::-1]
-            content_recommendations = self.courses.iloc[top_n_indices]
-            return content_recommendations['course_id'].tolist()
+            cosine_similarities = self.similarity_scores(user_profile_vector)
+            top_n_indices = top_n_columns(cosine_similarities, top_n)[0]
+            top_n_indices = top_n_indices[np.isfinite(cosine_similarities[0, top_n_indices])]
+            return self.course_ids[top_n_indices].tolist()
         except Exception as e:
             logger.error(f"Error in content-based recommendation for user {user_id}: {e}")
             raise CustomException(e, sys)
 
+    def use_graph_content(self):
+        return self.input.content_from_graph and self.similarity_graph is not None
+
+    def graph_content_scores(self, rating_rows):
+        """
+        Scores courses by summing their similarities to each user's rated
+        courses over the neighbour graph, instead of scanning the catalog.
+        The cosine between a course and a user's mean profile is that sum
+        divided by the profile norm, so the sum is divided by the norm as well.
+        Only rated courses and their graph neighbours receive a score.
+
+        Args:
+            rating_rows (np.ndarray): Rows of `rated_matrix`; -1 for users without ratings.
+
+        Returns:
+            np.ndarray: Score matrix of shape (len(rating_rows), number of courses),
+            with -inf for courses that are not reached.
+        """
+        scores = np.full((len(rating_rows), len(self.course_ids)), -np.inf, dtype=self.dtype)
+        known_users = np.flatnonzero(rating_rows >= 0)
+        if len(known_users):
+            rated = self.rated_matrix[rating_rows[known_users]]
+            profiles = rated @ self.vectors
+            profile_norms = np.sqrt(np.asarray(profiles.multiply(profiles).sum(axis=1)).ravel())
+            reached = (rated @ self.graph_adjacency).tocoo()
+            norms = profile_norms[reached.row]
+            scores[known_users[reached.row], reached.col] = reached.data / np.where(norms > 0, norms, 1)
+        return scores
+
+    def similar_courses(self, course_id, top_n=10):
+        """
+        Finds the courses most similar to a given course, from the precomputed
+        neighbour graph when it holds enough neighbours and by a catalog scan
+        otherwise.
+
+        Args:
+            course_id (int): The course to find related courses for.
+            top_n (int): Number of related courses.
+
+        Returns:
+            pd.DataFrame: Related courses with a 'similarity' column, most similar
+            first; empty for unknown courses.
+        """
+        try:
+            row = self.course_index.row(course_id)
+            if row < 0:
+                rows, similarities = np.empty(0, dtype=np.int64), np.empty(0)
+            elif self.similarity_graph is not None and top_n <= self.similarity_graph.k:
+                rows, similarities = self.similarity_graph.neighbours(row)
+                rows, similarities = rows[:top_n], similarities[:top_n]
+            else:
+                scores = to_dense(self.vectors[row] @ self.vectors.T)
+                scores[0, row] = -np.inf
+                rows = top_n_columns(scores, top_n)[0]
+                rows = rows[scores[0, rows] > 0]
+                similarities = scores[0, rows]
+            related_courses = self.get_courses(rows)
+            related_courses['similarity'] = np.asarray(similarities, dtype=np.float64)
+            return related_courses
+        except Exception as e:
+            logger.error(f"Error finding courses similar to {course_id}: {e}")
+            raise CustomException(e, sys)
+
+    @metrics.timed('recommender_seconds', RECOMMENDER_HELP, recommender='svd')
     def svd_recommendations(self, user_id, top_n=3):
         try:
-            user_item_matrix = self.ratings.pivot(index='user_id', columns='course_id', values='rating').fillna(0)
-            user_item_matrix_sparse = csr_matrix(user_item_matrix.values)
-            U, sigma, Vt = svds(user_item_matrix_sparse, k=20)
-            sigma = np.diag(sigma)
-            user_factors = np.dot(np.dot(U, sigma), Vt)
-            user_ratings = user_factors[user_id - 1]
-            recommended_items = pd.Series(user_ratings, index=user_item_matrix.columns).sort_values(ascending=False)
-            recommended_courses = recommended_items.index[recommended_items > 0].tolist()
-            return recommended_courses[:top_n]
+            user_row = self.svd_user_index.row(user_id)
+            if user_row < 0:
+                logger.info(f"User {user_id} has no ratings in the SVD model.")
+                return []
+            user_ratings = self.svd_model['item_factors'] @ self.svd_model['user_factors'][user_row]
+            top_items = top_n_columns(user_ratings[None, :], top_n)[0]
+            top_items = top_items[user_ratings[top_items] > 0]
+            return self.svd_model['course_ids'][top_items].tolist()
         except Exception as e:
             logger.error(f"Error in SVD recommendation for user {user_id}: {e}")
             raise CustomException(e, sys)
 
+    @metrics.timed('recommender_seconds', RECOMMENDER_HELP, recommender='hybrid')
     def hybrid_recommendations_with_context_and_content(self, user_id, top_n=3, weights=None):
         try:
-            if weights is None:
-                weights = {
-                    'svd': 0.4,
-                    'context': 0.3,
-                    'content': 0.3
-                }
-            svd_recs = self.svd_recommendations(user_id, top_n)
-            context_recs = self.match_courses_with_context(user_id, top_n)
-            content_recs = self.content_based_recommendations(user_id, top_n)
-
-            course_scores = {}
-
-            def update_scores(recommendations, weight):
-                for course in recommendations:
-                    if course in course_scores:
-                        course_scores[course] += weight
-                    else:
-                        course_scores[course] = weight
-
-            update_scores(svd_recs, weights.get('svd', 1.0))
-            update_scores(context_recs, weights.get('context', 1.0))
-            update_scores(content_recs, weights.get('content', 1.0))
-
-            sorted_courses = sorted(course_scores.items(), key=lambda x: x[1], reverse=True)
-            top_course_ids = [course_id for course_id, score in sorted_courses[:top_n]]
-            recommended_courses = self.courses[self.courses['course_id'].isin(top_course_ids)]
+            scores = self.hybrid_score_matrix(np.array([user_id], dtype=np.int64), weights)
+            top_indices = top_n_columns(scores, top_n)[0]
+            top_indices = top_indices[np.isfinite(scores[0, top_indices])]
+            recommended_courses = self.get_courses(top_indices)
 
             logger.info(f"Hybrid recommendations generated for user {user_id}.")
             return recommended_courses
         except Exception as e:
             logger.error(f"Error in hybrid recommendation system for user {user_id}: {e}")
             raise CustomException(e, sys)
+
+    def hybrid_score_matrix(self, user_ids, weights=None):
+        """
+        Fuses the normalized SVD, context and content scores of every course with
+        the signal weights in one vectorized step. Courses a user has already
+        rated are masked out with -inf.
+
+        Args:
+            user_ids (np.ndarray): Users to score.
+            weights (dict, optional): Weights of the svd, context and content signals.
+
+        Returns:
+            np.ndarray: Score matrix of shape (len(user_ids), number of courses).
+        """
+        if weights is None:
+            weights = DEFAULT_WEIGHTS
+        scores = np.zeros((len(user_ids), len(self.course_ids)), dtype=self.dtype)
+        scored = np.zeros(len(user_ids), dtype=bool)
+        for name, score_matrix in (
+            ('svd', self.svd_score_matrix),
+            ('context', self.context_score_matrix),
+            ('content', self.content_score_matrix),
+        ):
+            with metrics.span('hybrid_component_seconds', COMPONENT_HELP, component=name):
+                signal = score_matrix(user_ids)
+            scores += weights.get(name, 1.0) * normalize_scores(signal)
+            scored |= np.isfinite(signal).any(axis=1)
+        # Users unknown to every signal get no recommendations
+        scores[~scored] = -np.inf
+
+        rows = self.rating_user_index.rows(user_ids)
+        known_users = np.flatnonzero(rows >= 0)
+        rated = self.rated_matrix[rows[known_users]].tocoo()
+        scores[known_users[rated.row], rated.col] = -np.inf
+        return scores
+
+    def svd_score_matrix(self, user_ids):
+        """
+        Predicts SVD ratings of every catalog course for many users at once.
+        Users and courses missing from the factor model are scored -inf.
+
+        Args:
+            user_ids (np.ndarray): Users to score.
+
+        Returns:
+            np.ndarray: Score matrix of shape (len(user_ids), number of courses).
+        """
+        rows = self.svd_user_index.rows(user_ids)
+        scores = np.full((len(user_ids), len(self.course_ids)), -np.inf, dtype=self.dtype)
+        known_users = np.flatnonzero(rows >= 0)
+        known_courses = self.svd_columns >= 0
+        predicted = self.svd_model['user_factors'][rows[known_users]] @ self.svd_model['item_factors'][known_courses].T
+        scores[np.ix_(known_users, self.svd_columns[known_courses])] = predicted
+        return scores
+
+    def context_score_matrix(self, user_ids):
+        """
+        Looks up the cosine similarities between every user's role and goal and
+        all courses in the context index. Users missing from the users table
+        are scored -inf.
+
+        Args:
+            user_ids (np.ndarray): Users to score.
+
+        Returns:
+            np.ndarray: Score matrix of shape (len(user_ids), number of courses).
+        """
+        rows = self.user_index.rows(user_ids)
+        scores = np.full((len(user_ids), len(self.course_ids)), -np.inf, dtype=self.dtype)
+        known_users = np.flatnonzero(rows >= 0)
+        if len(known_users):
+            scores[known_users] = self.context_index.scores(self.user_contexts(rows[known_users]))
+        return scores
+
+    def content_score_matrix(self, user_ids):
+        """
+        Computes cosine similarities between every user's mean rated-course vector
+        and all courses, or over the neighbour graph when one is loaded. Users
+        without ratings are scored -inf.
+
+        Args:
+            user_ids (np.ndarray): Users to score.
+
+        Returns:
+            np.ndarray: Score matrix of shape (len(user_ids), number of courses).
+        """
+        rows = self.rating_user_index.rows(user_ids)
+        if self.use_graph_content():
+            return self.graph_content_scores(rows)
+        scores = np.full((len(user_ids), len(self.course_ids)), -np.inf, dtype=self.dtype)
+        known_users = np.flatnonzero(rows >= 0)
+        if len(known_users):
+            # The mean profile is rescaled by the L2 normalisation, so a sum suffices
+            profiles = normalize_rows(self.rated_matrix[rows[known_users]] @ self.vectors)
+            scores[known_users] = self.similarity_scores(profiles)
+        return scores
+
+    @metrics.timed('recommender_seconds', RECOMMENDER_HELP, recommender='hybrid_batch')
+    def hybrid_recommendations_batch(self, user_ids, top_n=3, weights=None):
+        """
+        Scores many users in one matrix pass and returns, for each of them, the
+        same course frame as `hybrid_recommendations_with_context_and_content`.
+
+        Args:
+            user_ids (Iterable[int]): Users to generate recommendations for.
+            top_n (int): Number of courses to recommend per user.
+            weights (dict, optional): Weights of the svd, context and content signals.
+
+        Returns:
+            list: One pd.DataFrame of recommended courses per user, in input order.
+        """
+        try:
+            user_ids = np.asarray(user_ids, dtype=np.int64)
+            scores = self.hybrid_score_matrix(user_ids, weights)
+            top = top_n_columns(scores, top_n)
+            valid = np.isfinite(np.take_along_axis(scores, top, axis=1))
+            return [self.get_courses(top[i][valid[i]]) for i in range(len(user_ids))]
+        except Exception as e:
+            logger.error(f"Error in hybrid recommendation for {len(user_ids)} users: {e}")
+            raise CustomException(e, sys)
+
+    @metrics.timed('recommender_seconds', RECOMMENDER_HELP, recommender='batch')
+    def recommend_batch(self, user_ids, top_n=10, weights=None):
+        """
+        Generates hybrid recommendations for many users in one pass, scoring all
+        three signals with matrix-matrix products.
+
+        Args:
+            user_ids (Iterable[int]): Users to generate recommendations for.
+            top_n (int): Number of courses to recommend per user.
+            weights (dict, optional): Weights of the svd, context and content signals.
+
+        Returns:
+            pd.DataFrame: One row per recommendation with 'user_id', 'rank',
+            'course_id' and 'score' columns.
+        """
+        try:
+            user_ids = np.asarray(user_ids, dtype=np.int64)
+            scores = self.hybrid_score_matrix(user_ids, weights)
+
+            top = top_n_columns(scores, top_n)
+            top_scores = np.take_along_axis(scores, top, axis=1)
+            valid = np.isfinite(top_scores)
+            user_rows = np.broadcast_to(np.arange(len(user_ids))[:, None], top.shape)
+            recommendations = pd.DataFrame({
+                'user_id': user_ids[user_rows[valid]],
+                'rank': np.broadcast_to(np.arange(1, top.shape[1] + 1), top.shape)[valid].astype(np.int64),
+                'course_id': self.course_ids[top[valid]].astype(np.int64),
+                'score': top_scores[valid].astype(np.float64),
+            })
+            logger.info(f"Batch recommendations generated for {len(user_ids)} users.")
+            return recommendations
+        except Exception as e:
+            logger.error(f"Error in batch recommendation for {len(user_ids)} users: {e}")
+            raise CustomException(e, sys)
@@ -0,0 +1,179 @@
+from src.config.recommendation_cache import RecommendationCacheConfig
+from src.metrics import metrics
+from src.logger import logger
+from collections import OrderedDict
+import threading
+import hashlib
+import pickle
+import time
+import glob
+import os
+
+CACHE_HELP = "Recommendation cache lookups by result."
+
+
+def weights_key(weights):
+    """
+    Returns:
+        tuple: Hashable, order-independent form of a signal weights dict, or
+        None for the default weights. An empty dict gives an empty tuple, since
+        it weights every signal equally rather than by the defaults.
+    """
+    return tuple(sorted(weights.items())) if weights is not None else None
+
+
+class RecommendationCache:
+    """
+    LRU cache of recommendation results with a time-to-live.
+
+    Keys are `(user_id, top_n, weights, model_version)` tuples. An optional
+    on-disk tier keeps entries across restarts; its files are prefixed with
+    the user id so one user's entries can be dropped without scanning them.
+    Expired disk entries are deleted when read, and writes periodically prune
+    expired files and the oldest beyond `disk_max_entries`.
+    """
+
+    def __init__(self, config=None):
+        self.config = config if config is not None else RecommendationCacheConfig()
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._pruned_at = float('-inf')
+        if self.config.disk_dirpath:
+            os.makedirs(self.config.disk_dirpath, exist_ok=True)
+
+    def _disk_path(self, key):
+        digest = hashlib.sha1(repr(key).encode('utf-8')).hexdigest()
+        return os.path.join(self.config.disk_dirpath, f"{key[0]}_{digest}.pkl")
+
+    def _record(self, result):
+        metrics.increment('recommendation_cache_requests_total', 1, CACHE_HELP, result=result)
+
+    def get(self, key):
+        """
+        Args:
+            key (tuple): Cache key.
+
+        Returns:
+            The cached value, or None when it is missing or expired.
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at > now:
+                    self._entries.move_to_end(key)
+                    self._record('hit')
+                    return value
+                del self._entries[key]
+
+        if self.config.disk_dirpath:
+            value = self._read_disk(key)
+            if value is not None:
+                with self._lock:
+                    self._store(key, value, now)
+                    self._record('disk_hit')
+                return value
+
+        with self._lock:
+            self._record('miss')
+        return None
+
+    def put(self, key, value):
+        """
+        Args:
+            key (tuple): Cache key.
+            value: Result to cache.
+        """
+        with self._lock:
+            self._store(key, value, time.monotonic())
+        if self.config.disk_dirpath:
+            self._write_disk(key, value)
+
+    def _store(self, key, value, now):
+        self._entries[key] = (now + self.config.ttl_seconds, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.config.max_entries:
+            self._entries.popitem(last=False)
+
+    def _read_disk(self, key):
+        filepath = self._disk_path(key)
+        try:
+            with open(filepath, 'rb') as file:
+                created_at, stored_key, value = pickle.load(file)
+        except (OSError, EOFError, pickle.UnpicklingError):
+            return None
+        if stored_key != key:
+            return None
+        if time.time() - created_at > self.config.ttl_seconds:
+            self._remove(filepath)
+            return None
+        return value
+
+    def _write_disk(self, key, value):
+        filepath = self._disk_path(key)
+        try:
+            with open(f"{filepath}.tmp", 'wb') as file:
+                pickle.dump((time.time(), key, value), file, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(f"{filepath}.tmp", filepath)
+        except OSError as e:
+            logger.warning(f"Could not write recommendation cache entry {filepath}: {e}")
+        now = time.monotonic()
+        if now - self._pruned_at >= self.config.disk_prune_interval_seconds:
+            self._pruned_at = now
+            self._prune_disk()
+
+    def _remove(self, filepath):
+        try:
+            os.remove(filepath)
+        except OSError:
+            # Already removed, e.g. by another worker sharing the directory
+            pass
+
+    def _prune_disk(self):
+        """
+        Deletes expired files of the on-disk tier and, beyond `disk_max_entries`,
+        the oldest ones. File modification times stand in for creation times.
+        """
+        files = []
+        for filepath in glob.glob(os.path.join(self.config.disk_dirpath, "*.pkl")):
+            try:
+                files.append((os.path.getmtime(filepath), filepath))
+            except OSError:
+                continue
+        files.sort()
+        expired_before = time.time() - self.config.ttl_seconds
+        n_expired = sum(1 for modified_at, _ in files if modified_at < expired_before)
+        n_removed = max(n_expired, len(files) - self.config.disk_max_entries)
+        for _, filepath in files[:n_removed]:
+            self._remove(filepath)
+        if n_removed:
+            logger.info(f"Recommendation cache pruned {n_removed} files from {self.config.disk_dirpath}.")
+
+    def invalidate_users(self, user_ids):
+        """
+        Drops every cached entry of the given users from both tiers.
+
+        Args:
+            user_ids (Iterable[int]): Users whose entries to drop.
+        """
+        user_ids = {int(user_id) for user_id in user_ids}
+        with self._lock:
+            for key in [key for key in self._entries if key[0] in user_ids]:
+                del self._entries[key]
+        if self.config.disk_dirpath:
+            for user_id in user_ids:
+                for filepath in glob.glob(os.path.join(self.config.disk_dirpath, f"{user_id}_*.pkl")):
+                    self._remove(filepath)
+        logger.info(f"Recommendation cache invalidated for {len(user_ids)} users.")
+
+    def clear(self):
+        """
+        Drops every cached entry from both tiers.
+        """
+        with self._lock:
+            self._entries.clear()
+        if self.config.disk_dirpath:
+            for filepath in glob.glob(os.path.join(self.config.disk_dirpath, "*.pkl")):
+                self._remove(filepath)
+        logger.info("Recommendation cache cleared.")
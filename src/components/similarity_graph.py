@@ -0,0 +1,114 @@
+from src.logger import logger
+from src.exception import CustomException
+from src.components.ann_index import to_dense
+from scipy.sparse import csr_matrix, identity
+import numpy as np
+import sys
+
+
+class SimilarityGraph:
+    """
+    Top-K nearest-neighbour graph over the course TF-IDF vectors.
+
+    Row i of the CSR arrays lists the K most cosine-similar other courses of
+    catalog row i, in descending order of similarity. Courses with no
+    positive similarity are not listed.
+    """
+
+    def __init__(self, indptr, indices, scores):
+        self.indptr = indptr
+        self.indices = indices
+        self.scores = scores
+
+    @property
+    def n_courses(self):
+        return len(self.indptr) - 1
+
+    @property
+    def k(self):
+        return int(np.diff(self.indptr).max()) if self.n_courses else 0
+
+    @classmethod
+    def build(cls, vectors, k=50, block_bytes=2 ** 28):
+        """
+        Computes the graph block by block, so only a (block × courses) slice of
+        the similarity matrix exists at any time.
+
+        Args:
+            vectors (scipy.sparse.csr_matrix): L2-normalized TF-IDF matrix.
+            k (int): Neighbours kept per course.
+            block_bytes (int): Memory budget of one dense similarity block.
+
+        Returns:
+            SimilarityGraph: The built graph.
+        """
+        try:
+            n_courses = vectors.shape[0]
+            k = min(k, n_courses - 1)
+            block_size = max(1, block_bytes // (8 * max(n_courses, 1)))
+            logger.info(f"Building top-{k} similarity graph over {n_courses} courses in blocks of {block_size}.")
+            vectors_t = vectors.T.tocsc()
+            indptr = [0]
+            indices = []
+            scores = []
+            for start in range(0, n_courses, block_size):
+                similarities = to_dense(vectors[start:start + block_size] @ vectors_t)
+                rows = np.arange(similarities.shape[0])
+                similarities[rows, start + rows] = -np.inf
+                if k > 0:
+                    top = np.argpartition(-similarities, k - 1, axis=1)[:, :k]
+                    top_scores = np.take_along_axis(similarities, top, axis=1)
+                    order = np.argsort(-top_scores, axis=1, kind='stable')
+                    top = np.take_along_axis(top, order, axis=1)
+                    top_scores = np.take_along_axis(top_scores, order, axis=1)
+                else:
+                    top = np.empty((len(rows), 0), dtype=np.int64)
+                    top_scores = np.empty((len(rows), 0))
+                for row_top, row_scores in zip(top, top_scores):
+                    keep = row_scores > 0
+                    indices.append(row_top[keep])
+                    scores.append(row_scores[keep])
+                    indptr.append(indptr[-1] + int(keep.sum()))
+            return cls(
+                np.array(indptr, dtype=np.int64),
+                np.concatenate(indices).astype(np.int64) if indices else np.empty(0, dtype=np.int64),
+                np.concatenate(scores).astype(np.float32) if scores else np.empty(0, dtype=np.float32),
+            )
+        except Exception as e:
+            logger.exception(f"Error occurred while building similarity graph: {e}")
+            raise CustomException(e, sys)
+
+    def save(self, filepath):
+        np.savez(filepath, indptr=self.indptr, indices=self.indices, scores=self.scores)
+
+    @classmethod
+    def load(cls, filepath):
+        with np.load(filepath) as data:
+            return cls(data['indptr'], data['indices'], data['scores'])
+
+    def neighbours(self, row):
+        """
+        Args:
+            row (int): Catalog row of a course.
+
+        Returns:
+            tuple: Neighbour rows and their similarities, most similar first.
+        """
+        start, end = self.indptr[row], self.indptr[row + 1]
+        return self.indices[start:end], self.scores[start:end]
+
+    def adjacency(self, self_loops=False, dtype=np.float64):
+        """
+        Args:
+            self_loops (bool): Give every course a similarity of 1 with itself.
+            dtype (np.dtype): Value type of the matrix.
+
+        Returns:
+            scipy.sparse.csr_matrix: The graph as a (courses × courses) matrix.
+        """
+        matrix = csr_matrix(
+            (self.scores.astype(dtype), self.indices, self.indptr), shape=(self.n_courses, self.n_courses)
+        )
+        if self_loops:
+            matrix = (matrix + identity(self.n_courses, dtype=dtype, format='csr')).tocsr()
+        return matrix
@@ -0,0 +1,135 @@
+from src.logger import logger
+from src.exception import CustomException
+from src.config.top_n_table import TopNTableArtifact
+from src.config.prediction import PredictionInput
+from src.components.prediction import Prediction, IdIndex, DEFAULT_WEIGHTS, top_n_columns
+import numpy as np
+import json
+import sys
+
+
+class TopNTable:
+    """
+    Precomputed hybrid recommendations of every user.
+
+    Course ids are stored as a (users × top_n) matrix padded with -1, one row
+    per user in sorted user id order, and an `IdIndex` over the user ids maps
+    users to rows. The table records the SVD
+    model version and signal weights it was built with, so serving can tell
+    which requests it covers.
+    """
+
+    def __init__(self, user_ids, course_ids, scores, model_version, weights):
+        self.user_ids = user_ids
+        self.index = IdIndex(user_ids)
+        self.course_ids = course_ids
+        self.scores = scores
+        self.model_version = model_version
+        self.weights = weights
+
+    @property
+    def top_n(self):
+        return self.course_ids.shape[1]
+
+    @classmethod
+    def build(cls, predictor, top_n, weights=None, chunk_size=500):
+        """
+        Scores every user of the loaded predictor in chunks.
+
+        Args:
+            predictor (Prediction): Prediction with its artifacts loaded.
+            top_n (int): Courses stored per user.
+            weights (dict, optional): Weights of the svd, context and content signals.
+            chunk_size (int): Users scored per matrix pass.
+
+        Returns:
+            TopNTable: The built table.
+        """
+        weights = dict(DEFAULT_WEIGHTS if weights is None else weights)
+        user_ids = np.unique(predictor.user_ids).astype(np.int64)
+        course_ids = np.full((len(user_ids), top_n), -1, dtype=np.int64)
+        scores = np.full((len(user_ids), top_n), -np.inf, dtype=np.float32)
+        for start in range(0, len(user_ids), chunk_size):
+            chunk = user_ids[start:start + chunk_size]
+            chunk_scores = predictor.hybrid_score_matrix(chunk, weights)
+            top = top_n_columns(chunk_scores, top_n)
+            top_scores = np.take_along_axis(chunk_scores, top, axis=1)
+            valid = np.isfinite(top_scores)
+            rows = slice(start, start + len(chunk))
+            course_ids[rows, :top.shape[1]] = np.where(valid, predictor.course_ids[top], -1)
+            scores[rows, :top.shape[1]] = top_scores
+            logger.info(f"Materialized recommendations for users {start} to {start + len(chunk)}.")
+
+        return cls(user_ids, course_ids, scores, str(predictor.svd_model['version']), weights)
+
+    def save(self, filepath):
+        np.savez(
+            filepath,
+            user_ids=self.user_ids,
+            course_ids=self.course_ids,
+            scores=self.scores,
+            model_version=self.model_version,
+            weights=json.dumps(self.weights, sort_keys=True),
+        )
+
+    @classmethod
+    def load(cls, filepath):
+        with np.load(filepath) as data:
+            if 'user_ids' in data.files:
+                user_ids = data['user_ids']
+            else:
+                # Tables written with a dense id → row array list the users in row order
+                user_ids = np.flatnonzero(data['positions'] >= 0)
+            return cls(
+                user_ids, data['course_ids'], data['scores'],
+                str(data['model_version']), json.loads(str(data['weights']))
+            )
+
+    def covers(self, top_n, weights):
+        """
+        Returns:
+            bool: True if the table was built with these weights and stores at
+            least `top_n` courses per user.
+        """
+        return top_n <= self.top_n and dict(DEFAULT_WEIGHTS if weights is None else weights) == self.weights
+
+    def lookup(self, user_id):
+        """
+        Args:
+            user_id (int): User to look up.
+
+        Returns:
+            np.ndarray: Stored course ids in rank order, or None for users not in the table.
+        """
+        row = self.index.row(user_id)
+        if row < 0:
+            return None
+        course_ids = self.course_ids[row]
+        return course_ids[course_ids >= 0]
+
+
+class TopNMaterialization:
+    def __init__(self, input_config=None, artifact_config=None):
+        self.input = input_config if input_config is not None else PredictionInput()
+        self.artifact = artifact_config if artifact_config is not None else TopNTableArtifact()
+
+    def initiate_materialization(self):
+        """
+        Loads the freshly trained artifacts, precomputes the hybrid top-N of every
+        user in users.csv and saves it for lookup-first serving, together with
+        the context scores of every (role, goal) segment.
+        """
+        try:
+            logger.info("Initiating top-N materialization.")
+            predictor = Prediction(self.input)
+            predictor.load_input_data()
+            table = TopNTable.build(predictor, self.artifact.top_n, chunk_size=self.artifact.chunk_size)
+            table.save(self.artifact.filepath)
+            logger.info(f"Top-{table.top_n} table for {len(table.course_ids)} users saved to {self.artifact.filepath} successfully!")
+
+            # Scoring every user filled the context index with every (role, goal) segment
+            predictor.context_index.save(self.input.context_index_filepath)
+            logger.info(f"Context index with {len(predictor.context_index)} contexts saved to {self.input.context_index_filepath} successfully!")
+        except Exception as e:
+            logger.exception(f"Error occurred during top-N materialization: {e}")
+            raise CustomException(e, sys)
@@ -0,0 +1,26 @@
+from dataclasses import dataclass, field
+import os
+@dataclass
+class BenchmarkConfig():
+    work_dirpath: str = os.path.join('benchmark', 'data')
+    output_filepath: str = os.path.join('benchmark', 'results.json')
+    # Synthetic dataset sizes as (users, courses, ratings)
+    sizes: dict = field(default_factory=lambda: {
+        'small': (1000, 456, 10000),
+        'medium': (10000, 2000, 200000),
+        'large': (50000, 10000, 2000000),
+    })
+    repeats: int = 3
+    # Users scored per recommender measurement
+    sample_users: int = 50
+    # Relative slowdown against a baseline that counts as a regression
+    regression_tolerance: float = 0.2
+    # Import-time budget in seconds of every command's entry module, measured in a fresh interpreter
+    import_budgets: dict = field(default_factory=lambda: {
+        'main': 0.25,
+        'src.pipeline.prediction': 1.5,
+        'src.pipeline.batch_prediction': 1.5,
+        'src.pipeline.service': 1.5,
+        'src.pipeline.data_pusher': 1.5,
+        'src.pipeline.training': 4.0,
+    })
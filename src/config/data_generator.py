@@ -0,0 +1,15 @@
+from dataclasses import dataclass
+import os
+@dataclass
+class DataGeneratorConfig():
+    output_dirpath: str = 'synthetic'
+    course_filepath: str = os.path.join('Data','courses.csv')
+    num_users: int = 1000
+    num_courses: int = 456
+    num_ratings: int = 10000
+    # Zipf exponent of course popularity and lognormal spread of user activity
+    popularity_skew: float = 1.1
+    activity_sigma: float = 1.0
+    # Ratings generated and written per chunk
+    chunk_size: int = 1000000
+    seed: int = 42
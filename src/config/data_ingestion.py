@@ -1,9 +1,30 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 import os
 @dataclass
 class DataIngestionArtififact():
     course_filepath: str = os.path.join('artifact','courses.csv')
     users_filepath: str = os.path.join('artifact','users.csv')
     ratings_filepath: str = os.path.join('artifact','ratings.csv')
-
-
+    state_filepath: str = os.path.join('artifact','ingestion_state.yaml')
+    # Documents fetched per cursor round trip and rows written per CSV chunk
+    batch_size: int = 5000
+    chunk_size: int = 50000
+    max_workers: int = 3
+    collection_fields: dict = field(default_factory=lambda: {
+        "Course_details": ['Title', 'Instructor', 'Keywords', 'Learn', 'Description', 'course_id'],
+        "Ratings": ['user_id', 'course_id', 'rating'],
+        "User_details": ['user_id', 'role', 'goal'],
+    })
+    # Field compared against the stored high-water mark of each collection; the
+    # data pusher stamps it on every inserted or edited document
+    watermark_fields: dict = field(default_factory=lambda: {
+        "Course_details": 'updated_at',
+        "Ratings": 'updated_at',
+        "User_details": 'updated_at',
+    })
+    # Natural keys used to keep the latest version of re-fetched documents
+    merge_keys: dict = field(default_factory=lambda: {
+        "Course_details": ['course_id'],
+        "Ratings": ['user_id', 'course_id'],
+        "User_details": ['user_id'],
+    })
@@ -1,9 +1,28 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 import os
 @dataclass
 class DataTransformationInput():
     course_filepath: str = os.path.join('artifact','courses.csv')
 
+@dataclass
 class DataTransformationArtifact():
     vector_filepath: str =  os.path.join('artifact','tf-idf.npz')
-    vectorizer_filepath: str = os.path.join('artifact','vectorizer.pkl')
\ No newline at end of file
+    vectorizer_filepath: str = os.path.join('artifact','vectorizer.pkl')
+    state_filepath: str = os.path.join('artifact','tfidf_state.npz')
+    ann_index_filepath: str = os.path.join('artifact','ann_index.npz')
+    similarity_graph_filepath: str = os.path.join('artifact','similarity_graph.npz')
+    bundle_dirpath: str = os.path.join('artifact','bundle')
+    bundle_columns = ['Title', 'Instructor', 'Keywords', 'Learn', 'Description']
+    tfidf_params: dict = field(default_factory=lambda: {
+        'stop_words': 'english',
+        'ngram_range': (1, 3),
+        'max_features': 5000,
+    })
+    # Worker processes for fitting TF-IDF; 1 fits serially, -1 uses every core
+    n_jobs: int = -1
+    # Smaller catalogs are always fitted serially
+    parallel_min_courses: int = 20000
+    # Neighbours stored per course in the similarity graph
+    similarity_k: int = 50
+    # Memory budget of one dense block while building the similarity graph
+    similarity_block_bytes: int = 2 ** 28
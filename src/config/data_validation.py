@@ -4,5 +4,11 @@ import os
 class DataValidationInput():
     course_filepath: str = os.path.join('artifact','courses.csv')
 
+@dataclass
 class DataValidationArtifact():
-    report_filepath: str =  os.path.join('artifact','report.yaml')
\ No newline at end of file
+    report_filepath: str =  os.path.join('artifact','report.yaml')
+    # Rows read and checked at a time, bounding memory for large catalogs
+    chunk_size: int = 50000
+    max_workers: int = 4
+    # Failing rows listed per check in the report
+    max_samples: int = 5
@@ -0,0 +1,11 @@
+from dataclasses import dataclass
+import os
+
+# Training stages that the manifest can skip, in pipeline order
+TRAINING_STAGES = ('validation', 'transformation', 'model_training', 'materialization')
+
+@dataclass
+class ManifestArtifact():
+    filepath: str = os.path.join('artifact','manifest.yaml')
+    # Bytes read at a time while hashing input files
+    block_size: int = 1048576
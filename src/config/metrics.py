@@ -0,0 +1,9 @@
+from dataclasses import dataclass
+import os
+@dataclass
+class MetricsConfig():
+    prometheus_filepath: str = os.path.join('artifact','metrics.prom')
+    profile_dirpath: str = os.path.join('artifact','profiles')
+    # Latest observations kept per series for the p50/p95/p99 quantiles
+    max_samples: int = 10000
+    quantiles: tuple = (0.5, 0.95, 0.99)
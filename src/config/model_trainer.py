@@ -0,0 +1,16 @@
+from dataclasses import dataclass
+import os
+@dataclass
+class ModelTrainerInput():
+    ratings_filepath: str = os.path.join('artifact','ratings.csv')
+
+@dataclass
+class ModelTrainerArtifact():
+    model_filepath: str = os.path.join('artifact','svd_model.npz')
+    # Ratings the saved model was built from, compared against ratings.csv by incremental runs
+    state_filepath: str = os.path.join('artifact','svd_state.npz')
+    n_factors: int = 20
+    format_version: int = 2
+    # Incremental runs fold new ratings in until one of these triggers a full rebuild
+    full_rebuild_every: int = 24
+    max_fold_in_fraction: float = 0.2
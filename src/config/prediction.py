@@ -7,4 +7,26 @@ class PredictionInput():
     ratings_filepath: str = os.path.join('artifact','ratings.csv')
     tf_idf_filepath: str = os.path.join('artifact','tf-idf.npz')
     vectorizer_filepath: str = os.path.join('artifact','vectorizer.pkl')
+    # Holds the TF-IDF fingerprint the context index is checked against
+    tfidf_state_filepath: str = os.path.join('artifact','tfidf_state.npz')
+    svd_model_filepath: str = os.path.join('artifact','svd_model.npz')
+    ann_index_filepath: str = os.path.join('artifact','ann_index.npz')
+    top_n_filepath: str = os.path.join('artifact','top_n.npz')
+    similarity_graph_filepath: str = os.path.join('artifact','similarity_graph.npz')
+    context_index_filepath: str = os.path.join('artifact','context_index.npz')
+    # Memory-mapped bundle preferred over the CSV, pickle and npz artifacts when present
+    bundle_dirpath: str = os.path.join('artifact','bundle')
+    # Clusters probed per ANN query; raise for recall, lower for latency
+    ann_n_probe: int = 8
+    # Smaller catalogs are always scanned exactly
+    ann_min_courses: int = 10000
+    # Score the content signal from the similarity graph instead of a catalog scan
+    content_from_graph: bool = True
+    # Serve from float32 TF-IDF values, factors and score matrices and downcast
+    # numeric table columns, roughly halving the resident footprint per worker
+    low_memory: bool = False
 
+@dataclass
+class BatchPredictionArtifact():
+    output_filepath: str = os.path.join('artifact','batch_recommendations.parquet')
+    chunk_size: int = 500
@@ -0,0 +1,13 @@
+from dataclasses import dataclass
+@dataclass
+class RecommendationCacheConfig():
+    max_entries: int = 10000
+    ttl_seconds: float = 3600
+    # Set to a directory to keep entries across restarts and share them between workers
+    disk_dirpath: str = None
+    # Files kept in the on-disk tier; expired and the oldest files beyond it are pruned on write
+    disk_max_entries: int = 100000
+    # Seconds between prunes of the on-disk tier, which scan its directory
+    disk_prune_interval_seconds: float = 60
+    # Seconds between checks of the artifact files for a new training run
+    check_interval_seconds: float = 30
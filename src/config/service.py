@@ -0,0 +1,13 @@
+from dataclasses import dataclass
+@dataclass
+class ServiceConfig():
+    host: str = '0.0.0.0'
+    port: int = 8000
+    # Concurrent requests are collected for at most this long and scored together
+    max_wait_ms: float = 5
+    max_batch_size: int = 64
+    # Threads scoring batches; NumPy releases the GIL in the matrix products
+    executor_workers: int = 1
+    default_top_n: int = 10
+    max_top_n: int = 100
+    max_body_bytes: int = 1048576
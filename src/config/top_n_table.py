@@ -0,0 +1,8 @@
+from dataclasses import dataclass
+import os
+@dataclass
+class TopNTableArtifact():
+    filepath: str = os.path.join('artifact','top_n.npz')
+    # Stored per user; requests for up to this many courses are served from the table
+    top_n: int = 20
+    chunk_size: int = 500
@@ -1,34 +1,70 @@
 import logging
-from datetime import datetime
 import os
-import shutil
-from src.constant import TIMESTAMP  
+from src.constant import TIMESTAMP
 LOG_DIR = "logs"
+# Log files kept in LOG_DIR; the oldest are pruned when a process opens its own
+MAX_LOG_FILES = int(os.getenv("MAX_LOG_FILES", 100))
 
 
 def get_log_file_name():
-    return f"log_{TIMESTAMP}.log"
+    # The process id keeps concurrent runs started in the same second apart
+    return f"log_{TIMESTAMP}_{os.getpid()}.log"
 
 
 LOG_FILE_NAME = get_log_file_name()
 
-# Remove the existing log directory if it exists
-if os.path.exists(LOG_DIR):
-    shutil.rmtree(LOG_DIR)
-
-# Create a new log directory
-os.makedirs(LOG_DIR, exist_ok=True)
-
 # Define the full path for the log file
 LOG_FILE_PATH = os.path.join(LOG_DIR, LOG_FILE_NAME)
 
-# Configure the logging settings
-logging.basicConfig(
-    filename=LOG_FILE_PATH,
-    filemode="w",
-    format='[%(asctime)s] \t%(levelname)s \t%(lineno)d \t%(filename)s \t%(funcName)s() \t%(message)s',
-    level=logging.INFO
-)
+
+class LogFileHandler(logging.FileHandler):
+    """
+    File handler that creates the log directory and file when the first record
+    is written, so importing the logger has no effect on the file system.
+    Every process writes its own file, so the oldest files beyond
+    MAX_LOG_FILES are pruned at that point to keep the directory bounded.
+    """
+
+    def _open(self):
+        os.makedirs(os.path.dirname(self.baseFilename), exist_ok=True)
+        self.prune_logs()
+        return super()._open()
+
+    def prune_logs(self):
+        """
+        Deletes the oldest log files so that, with the one being opened, at
+        most MAX_LOG_FILES remain. Files another process removes first are skipped.
+        """
+        log_dir = os.path.dirname(self.baseFilename)
+        log_files = []
+        for name in os.listdir(log_dir):
+            path = os.path.join(log_dir, name)
+            if name.startswith("log_") and name.endswith(".log") and path != self.baseFilename:
+                try:
+                    log_files.append((os.path.getmtime(path), path))
+                except OSError:
+                    continue
+        log_files.sort()
+        for _, path in log_files[:max(len(log_files) - MAX_LOG_FILES + 1, 0)]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
+def configure_logging():
+    """
+    Sends log records to this process's log file. Called by the entry points
+    (main.py, app.py and the service) rather than at import, so importing a
+    `src` module leaves the logging configuration of the host process alone.
+    Only the first call has an effect.
+    """
+    # basicConfig does nothing once the root logger has handlers
+    logging.basicConfig(
+        handlers=[LogFileHandler(LOG_FILE_PATH, mode="w", delay=True)],
+        format='[%(asctime)s] \t%(levelname)s \t%(lineno)d \t%(filename)s \t%(funcName)s() \t%(message)s',
+        level=logging.INFO
+    )
 
 # Create a logger instance
 logger = logging.getLogger("Course Recommendation System Logs")
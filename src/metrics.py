@@ -0,0 +1,222 @@
+from src.config.metrics import MetricsConfig
+from contextlib import contextmanager
+from collections import deque
+from datetime import datetime
+import numpy as np
+import threading
+import functools
+import cProfile
+import time
+import os
+
+ROWS_HELP = "Number of rows in a dataset table."
+
+
+def label_key(labels):
+    return tuple(sorted(labels.items()))
+
+
+def format_labels(labels, **extra):
+    labels = {**dict(labels), **extra}
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{name}="{value}"' for name, value in labels.items()) + '}'
+
+
+class MetricsRegistry:
+    """
+    In-process registry of timing summaries, counters and gauges.
+
+    Timings keep a bounded window of recent observations per label set, from
+    which p50/p95/p99 are computed, plus an all-time count and sum. The
+    registry renders itself in the Prometheus text exposition format.
+    """
+
+    def __init__(self, config=None):
+        self.config = config if config is not None else MetricsConfig()
+        self._lock = threading.Lock()
+        self._summaries = {}
+        self._gauges = {}
+        self._counters = {}
+        self._help = {}
+
+    def observe(self, name, value, help_text=None, **labels):
+        """
+        Records one observation of a summary metric.
+
+        Args:
+            name (str): Metric name, e.g. 'prediction_request_seconds'.
+            value (float): Observed value.
+            help_text (str, optional): Description exported as # HELP.
+            **labels: Label values of the series.
+        """
+        with self._lock:
+            series = self._summaries.setdefault(name, {})
+            samples, count, total = series.get(label_key(labels), (deque(maxlen=self.config.max_samples), 0, 0.0))
+            samples.append(value)
+            series[label_key(labels)] = (samples, count + 1, total + value)
+            if help_text:
+                self._help[name] = help_text
+
+    def set_gauge(self, name, value, help_text=None, **labels):
+        """
+        Sets the current value of a gauge metric.
+
+        Args:
+            name (str): Metric name, e.g. 'artifact_size_bytes'.
+            value (float): Current value.
+            help_text (str, optional): Description exported as # HELP.
+            **labels: Label values of the series.
+        """
+        with self._lock:
+            self._gauges.setdefault(name, {})[label_key(labels)] = value
+            if help_text:
+                self._help[name] = help_text
+
+    def increment(self, name, amount=1, help_text=None, **labels):
+        """
+        Adds to a monotonically increasing counter metric.
+
+        Args:
+            name (str): Metric name, ending in '_total' by convention.
+            amount (float): Amount to add.
+            help_text (str, optional): Description exported as # HELP.
+            **labels: Label values of the series.
+        """
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[label_key(labels)] = series.get(label_key(labels), 0) + amount
+            if help_text:
+                self._help[name] = help_text
+
+    @contextmanager
+    def span(self, name, help_text=None, **labels):
+        """
+        Times the enclosed block and records it as an observation in seconds.
+        The duration is recorded even when the block raises.
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, help_text, **labels)
+
+    def timed(self, name, help_text=None, **labels):
+        """
+        Decorator form of `span` that times every call of the wrapped function.
+        """
+        def decorator(function):
+            @functools.wraps(function)
+            def wrapper(*args, **kwargs):
+                with self.span(name, help_text, **labels):
+                    return function(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def quantiles(self, name, **labels):
+        """
+        Returns:
+            dict: p50/p95/p99 of the recent observations, keyed by quantile, plus
+            'count' and 'sum'; empty when the series has no observations.
+        """
+        with self._lock:
+            series = self._summaries.get(name, {}).get(label_key(labels))
+            if series is None:
+                return {}
+            samples, count, total = np.array(series[0]), series[1], series[2]
+        values = np.quantile(samples, self.config.quantiles)
+        return {**dict(zip(self.config.quantiles, values.tolist())), 'count': count, 'sum': total}
+
+    def record_file_sizes(self, filepaths):
+        """
+        Exports the on-disk size of every existing artifact; directories are
+        summed over their files.
+
+        Args:
+            filepaths (dict): Artifact name to file or directory path.
+        """
+        for artifact, filepath in filepaths.items():
+            if os.path.isdir(filepath):
+                size = sum(entry.stat().st_size for entry in os.scandir(filepath) if entry.is_file())
+            elif os.path.exists(filepath):
+                size = os.path.getsize(filepath)
+            else:
+                continue
+            self.set_gauge('artifact_size_bytes', size, "Size of a training artifact on disk.", artifact=artifact)
+
+    def render_prometheus(self):
+        """
+        Returns:
+            str: All metrics in the Prometheus text exposition format.
+        """
+        lines = []
+        with self._lock:
+            summaries = {name: dict(series) for name, series in self._summaries.items()}
+            gauges = {name: dict(series) for name, series in self._gauges.items()}
+            counters = {name: dict(series) for name, series in self._counters.items()}
+            help_texts = dict(self._help)
+
+        for name, series in sorted(summaries.items()):
+            if name in help_texts:
+                lines.append(f"# HELP {name} {help_texts[name]}")
+            lines.append(f"# TYPE {name} summary")
+            for labels, (samples, count, total) in sorted(series.items()):
+                for quantile, value in zip(self.config.quantiles, np.quantile(np.array(samples), self.config.quantiles)):
+                    lines.append(f"{name}{format_labels(labels, quantile=quantile)} {value:.9g}")
+                lines.append(f"{name}_sum{format_labels(labels)} {total:.9g}")
+                lines.append(f"{name}_count{format_labels(labels)} {count}")
+
+        for metric_type, metric_series in (('counter', counters), ('gauge', gauges)):
+            for name, series in sorted(metric_series.items()):
+                if name in help_texts:
+                    lines.append(f"# HELP {name} {help_texts[name]}")
+                lines.append(f"# TYPE {name} {metric_type}")
+                for labels, value in sorted(series.items()):
+                    lines.append(f"{name}{format_labels(labels)} {value:.9g}")
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, filepath=None):
+        """
+        Writes the metrics as a Prometheus text file, e.g. for the node exporter
+        textfile collector. The file is swapped in atomically.
+
+        Args:
+            filepath (str, optional): Output path. Defaults to the configured path.
+
+        Returns:
+            str: The path written.
+        """
+        filepath = filepath or self.config.prometheus_filepath
+        os.makedirs(os.path.dirname(filepath) or '.', exist_ok=True)
+        with open(f"{filepath}.tmp", 'w') as file:
+            file.write(self.render_prometheus())
+        os.replace(f"{filepath}.tmp", filepath)
+        return filepath
+
+    @contextmanager
+    def profile(self, name, enabled=True):
+        """
+        Profiles the enclosed block with cProfile and dumps the stats to
+        `profile_dirpath`, for inspection with pstats or snakeviz. Does nothing
+        unless `enabled`.
+
+        Args:
+            name (str): Prefix of the stats file.
+            enabled (bool): Whether to profile.
+        """
+        if not enabled:
+            yield
+            return
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            yield
+        finally:
+            profiler.disable()
+            os.makedirs(self.config.profile_dirpath, exist_ok=True)
+            filename = f"{name}_{datetime.now().strftime('%Y%m%d%H%M%S%f')}.prof"
+            profiler.dump_stats(os.path.join(self.config.profile_dirpath, filename))
+
+
+# Process-wide registry shared by the pipelines
+metrics = MetricsRegistry()
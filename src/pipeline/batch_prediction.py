@@ -0,0 +1,51 @@
+from src.pipeline.engine import get_engine
+from src.config.prediction import BatchPredictionArtifact
+from src.logger import logger
+from src.exception import CustomException
+import pyarrow as pa
+import pyarrow.parquet as pq
+import numpy as np
+import sys
+
+class BatchPredict:
+    def __init__(self, engine=None):
+        self.engine = engine if engine is not None else get_engine()
+        self.artifact = BatchPredictionArtifact()
+
+    def initiate_batch_prediction(self, user_ids=None, top_n=10):
+        """
+        Scores users chunk by chunk and streams the recommendations to a Parquet file.
+
+        Args:
+            user_ids (Iterable[int], optional): Users to score. Defaults to every user in users.csv.
+            top_n (int): Number of courses to recommend per user.
+
+        Returns:
+            str: Path of the written Parquet file.
+        """
+        writer = None
+        try:
+            self.engine.load()
+            predictor = self.engine.predictor
+            if user_ids is None:
+                user_ids = predictor.user_ids
+            user_ids = np.asarray(user_ids, dtype=np.int64)
+            logger.info(f"Initiating batch prediction for {len(user_ids)} users.")
+
+            for start in range(0, len(user_ids), self.artifact.chunk_size):
+                chunk = user_ids[start:start + self.artifact.chunk_size]
+                recommendations = self.engine.recommend_batch(chunk, top_n=top_n)
+                table = pa.Table.from_pandas(recommendations, preserve_index=False)
+                if writer is None:
+                    writer = pq.ParquetWriter(self.artifact.output_filepath, table.schema)
+                writer.write_table(table)
+                logger.info(f"Wrote recommendations for users {start} to {start + len(chunk)}.")
+
+            logger.info(f"Batch recommendations saved to {self.artifact.output_filepath} successfully!")
+            return self.artifact.output_filepath
+        except Exception as e:
+            logger.exception(f"Error occurred during batch prediction: {e}")
+            raise CustomException(e, sys)
+        finally:
+            if writer is not None:
+                writer.close()
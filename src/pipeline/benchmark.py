@@ -0,0 +1,280 @@
+from src.components.data_generator import DataGenerator
+from src.components.data_transformation import DataTransformation
+from src.components.data_validation import DataValidation
+from src.components.model_trainer import ModelTrainer
+from src.components.prediction import Prediction
+from src.config.benchmark import BenchmarkConfig
+from src.config.data_generator import DataGeneratorConfig
+from src.config.data_transformation import DataTransformationInput, DataTransformationArtifact
+from src.config.model_trainer import ModelTrainerInput, ModelTrainerArtifact
+from src.config.prediction import PredictionInput
+from src.logger import logger
+from src.exception import CustomException
+from datetime import datetime
+import pandas as pd
+import numpy as np
+import subprocess
+import platform
+import tracemalloc
+import time
+import json
+import sys
+import os
+
+
+def measure(fn, repeats, n_items):
+    """
+    Times `fn` over several runs, then runs it once more under tracemalloc to
+    record peak memory without the tracing overhead skewing the timings.
+
+    Args:
+        fn (Callable): Zero-argument function to measure.
+        repeats (int): Number of timed runs.
+        n_items (int): Items processed per run, used for throughput.
+
+    Returns:
+        dict: Median and minimum wall time, peak memory and throughput.
+    """
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    wall_time = float(np.median(timings))
+    return {
+        'wall_time_s': wall_time,
+        'min_wall_time_s': float(min(timings)),
+        'peak_memory_mb': peak / 2 ** 20,
+        'items': n_items,
+        'throughput_per_s': n_items / wall_time if wall_time > 0 else None,
+    }
+
+
+def measure_import(module, repeats):
+    """
+    Times importing a module in fresh interpreters, so that nothing imported by
+    this process is already cached.
+
+    Args:
+        module (str): Dotted module name.
+        repeats (int): Number of interpreters to time.
+
+    Returns:
+        float: Fastest import time in seconds.
+    """
+    code = f"import time; start = time.perf_counter(); import {module}; print(time.perf_counter() - start)"
+    timings = []
+    for _ in range(repeats):
+        output = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True).stdout
+        timings.append(float(output.split()[-1]))
+    return min(timings)
+
+
+def compare_results(baseline, current, tolerance):
+    """
+    Lists stages whose median wall time grew by more than `tolerance`.
+
+    Args:
+        baseline (dict): Earlier benchmark report.
+        current (dict): New benchmark report.
+        tolerance (float): Allowed relative slowdown, e.g. 0.2 for 20%.
+
+    Returns:
+        list: One dict per regressed (size, stage).
+    """
+    regressions = []
+    for size, stages in current['results'].items():
+        for stage, result in stages.items():
+            previous = baseline.get('results', {}).get(size, {}).get(stage)
+            if previous and result['wall_time_s'] > previous['wall_time_s'] * (1 + tolerance):
+                regressions.append({
+                    'size': size,
+                    'stage': stage,
+                    'baseline_s': previous['wall_time_s'],
+                    'current_s': result['wall_time_s'],
+                })
+    return regressions
+
+
+class Benchmark:
+    def __init__(self, config=None):
+        self.config = config if config is not None else BenchmarkConfig()
+
+    def prepare_artifacts(self, size_name, num_users, num_courses, num_ratings):
+        """
+        Generates a synthetic dataset and trains the artifacts the prediction
+        pipeline needs, in a directory of its own.
+
+        Returns:
+            str: Directory holding the dataset and artifacts.
+        """
+        dirpath = os.path.join(self.config.work_dirpath, size_name)
+        DataGenerator(DataGeneratorConfig(
+            output_dirpath=dirpath,
+            num_users=num_users,
+            num_courses=num_courses,
+            num_ratings=num_ratings
+        )).initiate_data_generation()
+        DataTransformation(
+            DataTransformationInput(course_filepath=os.path.join(dirpath, 'courses.csv')),
+            self.transformation_artifact(dirpath)
+        ).initiate_data_transformation()
+        ModelTrainer(
+            ModelTrainerInput(ratings_filepath=os.path.join(dirpath, 'ratings.csv')),
+            ModelTrainerArtifact(
+                model_filepath=os.path.join(dirpath, 'svd_model.npz'),
+                state_filepath=os.path.join(dirpath, 'svd_state.npz')
+            )
+        ).initiate_model_training()
+        return dirpath
+
+    def transformation_artifact(self, dirpath):
+        return DataTransformationArtifact(
+            vector_filepath=os.path.join(dirpath, 'tf-idf.npz'),
+            vectorizer_filepath=os.path.join(dirpath, 'vectorizer.pkl'),
+            state_filepath=os.path.join(dirpath, 'tfidf_state.npz'),
+            ann_index_filepath=os.path.join(dirpath, 'ann_index.npz'),
+            similarity_graph_filepath=os.path.join(dirpath, 'similarity_graph.npz'),
+            bundle_dirpath=os.path.join(dirpath, 'bundle')
+        )
+
+    def prediction_input(self, dirpath):
+        return PredictionInput(
+            course_filepath=os.path.join(dirpath, 'courses.csv'),
+            users_filepath=os.path.join(dirpath, 'users.csv'),
+            ratings_filepath=os.path.join(dirpath, 'ratings.csv'),
+            tf_idf_filepath=os.path.join(dirpath, 'tf-idf.npz'),
+            vectorizer_filepath=os.path.join(dirpath, 'vectorizer.pkl'),
+            tfidf_state_filepath=os.path.join(dirpath, 'tfidf_state.npz'),
+            svd_model_filepath=os.path.join(dirpath, 'svd_model.npz'),
+            ann_index_filepath=os.path.join(dirpath, 'ann_index.npz'),
+            top_n_filepath=os.path.join(dirpath, 'top_n.npz'),
+            similarity_graph_filepath=os.path.join(dirpath, 'similarity_graph.npz'),
+            context_index_filepath=os.path.join(dirpath, 'context_index.npz'),
+            bundle_dirpath=os.path.join(dirpath, 'bundle')
+        )
+
+    def benchmark_size(self, dirpath):
+        """
+        Measures every training and prediction stage on one prepared dataset.
+
+        Returns:
+            dict: Measurements per stage.
+        """
+        repeats = self.config.repeats
+        results = {}
+
+        courses = pd.read_csv(os.path.join(dirpath, 'courses.csv'))
+        validator = DataValidation()
+        results['validate_data'] = measure(lambda: validator.validate_data(courses), repeats, len(courses))
+        transformer = DataTransformation()
+        cleaned = transformer.get_cleaned_data(courses.copy())
+        results['get_vectors'] = measure(lambda: transformer.get_vectors(cleaned.copy()), repeats, len(courses))
+
+        prediction_input = self.prediction_input(dirpath)
+        predictor = Prediction(prediction_input)
+        n_ratings = len(pd.read_csv(prediction_input.ratings_filepath, usecols=['user_id']))
+        results['load_input_data'] = measure(lambda: Prediction(prediction_input).load_input_data(), repeats, n_ratings)
+        predictor.load_input_data()
+
+        # Sample users with ratings so that every single-signal recommender has input
+        rng = np.random.default_rng(0)
+        candidates = predictor.rating_user_ids
+        user_ids = rng.choice(candidates, min(self.config.sample_users, len(candidates)), replace=False)
+        recommenders = {
+            'svd_recommendations': predictor.svd_recommendations,
+            'match_courses_with_context': predictor.match_courses_with_context,
+            'content_based_recommendations': predictor.content_based_recommendations,
+            'hybrid_recommendations': predictor.hybrid_recommendations_with_context_and_content,
+        }
+        for stage, recommend in recommenders.items():
+            results[stage] = measure(
+                lambda: [recommend(int(user_id), 10) for user_id in user_ids], repeats, len(user_ids)
+            )
+        results['recommend_batch'] = measure(lambda: predictor.recommend_batch(user_ids, 10), repeats, len(user_ids))
+        return results
+
+    def check_import_budget(self):
+        """
+        Measures how long the entry module of every command takes to import and
+        compares it with its budget, so that an eager import of a heavy library
+        on a short-lived command path is caught.
+
+        Returns:
+            dict: Import time, budget and whether it was met, per module.
+        """
+        try:
+            results = {}
+            for module, budget in self.config.import_budgets.items():
+                seconds = measure_import(module, self.config.repeats)
+                results[module] = {'import_s': seconds, 'budget_s': budget, 'within_budget': seconds <= budget}
+                if seconds > budget:
+                    logger.warning(f"Importing {module} took {seconds:.3f}s, over its {budget:.3f}s budget.")
+            return results
+        except Exception as e:
+            logger.exception(f"Error occurred while checking the import budget: {e}")
+            raise CustomException(e, sys)
+
+    def get_environment(self):
+        try:
+            commit = subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True).stdout.strip()
+        except OSError:
+            commit = None
+        return {
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'commit': commit or None,
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'pandas': pd.__version__,
+            'machine': platform.machine(),
+            'cpu_count': os.cpu_count(),
+        }
+
+    def initiate_benchmark(self, size_names=None, baseline_filepath=None):
+        """
+        Runs the benchmark suite for the selected dataset sizes and writes a JSON
+        report. When a baseline report is given, stages that slowed down beyond
+        the regression tolerance are reported. The report also holds the import
+        time of every command against its budget.
+
+        Args:
+            size_names (list, optional): Names of the sizes to run. Defaults to all.
+            baseline_filepath (str, optional): Earlier report to compare against.
+
+        Returns:
+            dict: The benchmark report.
+        """
+        try:
+            size_names = size_names or list(self.config.sizes)
+            report = {'environment': self.get_environment(), 'sizes': {}, 'results': {}}
+            report['imports'] = self.check_import_budget()
+            for size_name in size_names:
+                num_users, num_courses, num_ratings = self.config.sizes[size_name]
+                logger.info(f"Benchmarking size {size_name}: {num_users} users, {num_courses} courses, {num_ratings} ratings.")
+                dirpath = self.prepare_artifacts(size_name, num_users, num_courses, num_ratings)
+                report['sizes'][size_name] = {'users': num_users, 'courses': num_courses, 'ratings': num_ratings}
+                report['results'][size_name] = self.benchmark_size(dirpath)
+
+            if baseline_filepath:
+                with open(baseline_filepath) as file:
+                    baseline = json.load(file)
+                report['regressions'] = compare_results(baseline, report, self.config.regression_tolerance)
+                for regression in report['regressions']:
+                    logger.warning(f"Benchmark regression: {regression}")
+
+            os.makedirs(os.path.dirname(self.config.output_filepath), exist_ok=True)
+            with open(self.config.output_filepath, 'w') as file:
+                json.dump(report, file, indent=2)
+            logger.info(f"Benchmark report written to {self.config.output_filepath}")
+            return report
+        except Exception as e:
+            logger.exception(f"Error occurred during benchmark: {e}")
+            raise CustomException(e, sys)
@@ -0,0 +1,324 @@
+from src.components.prediction import Prediction
+from src.components.recommendation_cache import RecommendationCache, weights_key
+from src.components.top_n_table import TopNTable
+from src.logger import logger
+from src.exception import CustomException
+import numpy as np
+import threading
+import hashlib
+import time
+import sys
+import os
+
+
+class RecommenderEngine:
+    """
+    Long-lived owner of the loaded prediction artifacts.
+
+    The engine loads the course, user and rating tables, the TF-IDF matrix and
+    the fitted vectorizer exactly once and then serves every recommendation
+    request from memory. Requests covered by the top-N table materialized at
+    training time are answered by lookup; other results are cached per `(user_id, top_n, weights,
+    model_version)`; the engine periodically checks the artifact files and
+    hot-reloads them after a training run. Use `get_engine()` to obtain the
+    process-wide instance.
+    """
+
+    def __init__(self, predictor=None, cache=None):
+        self.predictor = predictor if predictor is not None else Prediction()
+        self.cache = cache if cache is not None else RecommendationCache()
+        self._lock = threading.Lock()
+        self._ready = False
+        self._checked_at = 0.0
+        self._fingerprint = None
+        self._digests = None
+        self.model_version = None
+        self.top_n_table = None
+
+    def artifact_fingerprint(self):
+        """
+        Returns:
+            tuple: Modification times and sizes of the model artifacts and of the
+            user and rating tables, as two separate tuples.
+        """
+        paths = self.predictor.input
+        model_paths = [
+            paths.course_filepath, paths.tf_idf_filepath, paths.vectorizer_filepath, paths.tfidf_state_filepath,
+            paths.svd_model_filepath, paths.ann_index_filepath, paths.top_n_filepath,
+            paths.similarity_graph_filepath, paths.context_index_filepath,
+            os.path.join(paths.bundle_dirpath, 'meta.json'),
+        ]
+        data_paths = [paths.users_filepath, paths.ratings_filepath]
+
+        def stat(path):
+            if not os.path.exists(path):
+                return None
+            info = os.stat(path)
+            return info.st_mtime_ns, info.st_size
+        return tuple(stat(path) for path in model_paths), tuple(stat(path) for path in data_paths)
+
+    def model_inputs(self, fingerprint):
+        """
+        Returns:
+            tuple: The part of the fingerprint the served model depends on. A model
+            factorized in memory also depends on the rating table.
+        """
+        if self.predictor.svd_model['version'] == 'in-memory':
+            return fingerprint
+        return fingerprint[0]
+
+    def _activate(self, predictor, fingerprint):
+        """
+        Makes a loaded predictor the one serving requests and records what it was loaded from.
+        """
+        self.predictor = predictor
+        self._fingerprint = fingerprint
+        self._digests = predictor.user_digests()
+        model_digest = hashlib.sha1(repr(self.model_inputs(fingerprint)).encode('utf-8')).hexdigest()[:8]
+        self.model_version = f"{predictor.svd_model['version']}-{model_digest}"
+        self.top_n_table = self.load_top_n_table(predictor)
+        self._checked_at = time.monotonic()
+
+    def load_top_n_table(self, predictor):
+        """
+        Returns:
+            TopNTable: The materialized recommendations, or None when there are
+            none or they were built from a different SVD model.
+        """
+        filepath = predictor.input.top_n_filepath
+        if not os.path.exists(filepath):
+            return None
+        table = TopNTable.load(filepath)
+        if table.model_version != str(predictor.svd_model['version']):
+            logger.warning(f"Top-N table at {filepath} was built for model {table.model_version}; ignoring it.")
+            return None
+        logger.info(f"Top-{table.top_n} table for {len(table.course_ids)} users loaded successfully.")
+        return table
+
+    def lookup(self, user_id, top_n=10, weights=None):
+        """
+        Serves a request from the materialized top-N table. Courses the user
+        rated since the table was built are skipped.
+
+        Returns:
+            pd.DataFrame: Recommended courses, or None when the table does not
+            cover the user, the weights or `top_n`.
+        """
+        table = self.top_n_table
+        if table is None or not table.covers(top_n, weights):
+            return None
+        course_ids = table.lookup(int(user_id))
+        if course_ids is None:
+            return None
+        predictor = self.predictor
+        rows = predictor.course_index.rows(course_ids)
+        rating_row = predictor.rating_user_index.row(int(user_id))
+        rated = predictor.rated_matrix[rating_row].indices if rating_row >= 0 else []
+        keep = rows[(rows >= 0) & ~np.isin(rows, rated)]
+        if len(keep) < min(top_n, len(course_ids)):
+            return None
+        return predictor.get_courses(keep[:top_n])
+
+    def load(self):
+        """
+        Loads all prediction artifacts if they have not been loaded yet.
+
+        Raises:
+            CustomException: If the artifacts cannot be loaded.
+        """
+        if self._ready:
+            return
+        with self._lock:
+            if self._ready:
+                return
+            try:
+                logger.info("Loading recommender engine artifacts.")
+                fingerprint = self.artifact_fingerprint()
+                self.predictor.load_input_data()
+                self._activate(self.predictor, fingerprint)
+                self._ready = True
+                logger.info(f"Recommender engine artifacts loaded successfully (model {self.model_version}).")
+            except Exception as e:
+                logger.exception(f"Error occurred while loading recommender engine: {e}")
+                raise CustomException(e, sys)
+
+    def refresh(self, force=False):
+        """
+        Reloads the artifacts when their files changed since they were loaded.
+        New model artifacts clear the result cache; changed user or rating
+        tables only drop the entries of users whose profile or ratings changed.
+        Checks run at most every `check_interval_seconds` unless forced. A
+        failed reload, e.g. while training is still writing, keeps serving the
+        loaded artifacts.
+
+        Args:
+            force (bool): Check the files regardless of the interval.
+
+        Returns:
+            bool: True if new artifacts were loaded.
+        """
+        if not self._ready:
+            self.load()
+            return False
+        if not force and time.monotonic() - self._checked_at < self.cache.config.check_interval_seconds:
+            return False
+        with self._lock:
+            self._checked_at = time.monotonic()
+            fingerprint = self.artifact_fingerprint()
+            if fingerprint == self._fingerprint:
+                return False
+            try:
+                logger.info("Artifact files changed; reloading recommender engine.")
+                predictor = Prediction(self.predictor.input)
+                predictor.load_input_data()
+            except Exception as e:
+                logger.warning(f"Reloading recommender engine failed, keeping loaded artifacts: {e}")
+                return False
+
+            old_model_version, old_digests = self.model_version, self._digests
+            self._activate(predictor, fingerprint)
+            if self.model_version != old_model_version:
+                self.cache.clear()
+            else:
+                digests = old_digests.reindex(self._digests.index.union(old_digests.index))
+                changed = digests.index[digests.ne(self._digests.reindex(digests.index)).to_numpy()]
+                self.cache.invalidate_users(changed)
+            logger.info(f"Recommender engine reloaded (model {self.model_version}).")
+            return True
+
+    def warm_up(self, user_id=None):
+        """
+        Loads the artifacts and runs one recommendation so that the first real
+        request does not pay for lazy initialisation.
+
+        Args:
+            user_id (int, optional): User to score during warm-up. Defaults to the
+                first user in the users table.
+        """
+        try:
+            self.load()
+            if user_id is None:
+                user_id = int(self.predictor.users['user_id'].iloc[0])
+            self.recommend(user_id)
+            logger.info(f"Recommender engine warmed up with user {user_id}.")
+        except Exception as e:
+            logger.exception(f"Error occurred during recommender engine warm-up: {e}")
+            raise CustomException(e, sys)
+
+    def is_ready(self):
+        """
+        Returns:
+            bool: True once all artifacts are loaded and requests can be served.
+        """
+        return self._ready
+
+    def recommend(self, user_id, top_n=10, weights=None):
+        """
+        Generates hybrid recommendations for a user from the loaded artifacts.
+        Requests covered by the top-N table are answered by lookup and repeated
+        requests from the result cache; only the rest are scored live.
+
+        Args:
+            user_id (int): The user to generate recommendations for.
+            top_n (int): Number of courses to recommend.
+            weights (dict, optional): Weights of the svd, context and content signals.
+
+        Returns:
+            pd.DataFrame: Recommended courses.
+        """
+        self.refresh()
+        recommendations = self.lookup(user_id, top_n, weights)
+        if recommendations is not None:
+            return recommendations
+        key = (int(user_id), top_n, weights_key(weights), self.model_version)
+        recommendations = self.cache.get(key)
+        if recommendations is None:
+            recommendations = self.predictor.hybrid_recommendations_with_context_and_content(
+                user_id=user_id, top_n=top_n, weights=weights
+            )
+            self.cache.put(key, recommendations)
+        # Callers get their own copy so they cannot alter the cached frame
+        return recommendations.copy()
+
+    def recommend_many(self, user_ids, top_n=10, weights=None):
+        """
+        Generates the same result as `recommend` for several users, scoring the
+        users missing from the top-N table and the cache together in one
+        batched pass.
+
+        Args:
+            user_ids (list): Users to generate recommendations for.
+            top_n (int): Number of courses to recommend per user.
+            weights (dict, optional): Weights of the svd, context and content signals.
+
+        Returns:
+            list: One pd.DataFrame of recommended courses per user, in input order.
+        """
+        self.refresh()
+        model_version = self.model_version
+        keys = [(int(user_id), top_n, weights_key(weights), model_version) for user_id in user_ids]
+        results = {key: self.lookup(key[0], top_n, weights) for key in set(keys)}
+        results = {key: self.cache.get(key) if recommendations is None else recommendations
+                   for key, recommendations in results.items()}
+        missing = [key for key, recommendations in results.items() if recommendations is None]
+        if missing:
+            batch = self.predictor.hybrid_recommendations_batch(
+                [key[0] for key in missing], top_n=top_n, weights=weights
+            )
+            for key, recommendations in zip(missing, batch):
+                self.cache.put(key, recommendations)
+                results[key] = recommendations
+        return [results[key].copy() for key in keys]
+
+    def recommend_batch(self, user_ids, top_n=10, weights=None):
+        """
+        Generates hybrid recommendations for many users in one pass. Batch runs
+        bypass the result cache.
+
+        Args:
+            user_ids (Iterable[int]): Users to generate recommendations for.
+            top_n (int): Number of courses to recommend per user.
+            weights (dict, optional): Weights of the svd, context and content signals.
+
+        Returns:
+            pd.DataFrame: One row per (user, recommended course).
+        """
+        self.refresh()
+        return self.predictor.recommend_batch(user_ids, top_n=top_n, weights=weights)
+
+    def similar_courses(self, course_id, top_n=10):
+        """
+        Finds the courses most similar to a given course.
+
+        Args:
+            course_id (int): The course to find related courses for.
+            top_n (int): Number of related courses.
+
+        Returns:
+            pd.DataFrame: Related courses with a 'similarity' column.
+        """
+        self.refresh()
+        return self.predictor.similar_courses(course_id, top_n=top_n)
+
+
+_engine = None
+_engine_lock = threading.Lock()
+
+
+def get_engine(input_config=None):
+    """
+    Returns the process-wide RecommenderEngine, creating it on first use.
+
+    Args:
+        input_config (PredictionInput, optional): Prediction settings of the
+            engine; only used when it is created.
+
+    Returns:
+        RecommenderEngine: The shared engine instance.
+    """
+    global _engine
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                _engine = RecommenderEngine(Prediction(input_config))
+    return _engine
@@ -1,9 +1,19 @@
-from src.components.prediction import Prediction
+from src.pipeline.engine import get_engine
+from src.metrics import metrics
 
 class Predict:
+    def __init__(self, engine=None, profile=False):
+        """
+        Args:
+            engine (RecommenderEngine, optional): Engine to serve from. Defaults to
+                the process-wide engine.
+            profile (bool): Dump a cProfile of every request to the profile directory.
+        """
+        self.engine = engine if engine is not None else get_engine()
+        self.profile = profile
 
     def initiate_prediction(self,user_id):
-        predictor = Prediction()
-        predictor.load_input_data()
-        recommended_courses = predictor.hybrid_recommendations_with_context_and_content(user_id=user_id, top_n=10)
+        with metrics.profile(f"prediction_user_{user_id}", enabled=self.profile):
+            with metrics.span('prediction_request_seconds', "End-to-end latency of a prediction request."):
+                recommended_courses = self.engine.recommend(user_id=user_id, top_n=10)
         return recommended_courses[['course_id', 'Title', 'Description', 'Instructor']]
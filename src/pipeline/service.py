@@ -0,0 +1,286 @@
+from src.pipeline.engine import get_engine
+from src.components.prediction import DEFAULT_WEIGHTS
+from src.components.recommendation_cache import weights_key
+from src.config.service import ServiceConfig
+from src.metrics import metrics
+from src.logger import logger, configure_logging
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit, parse_qs
+from http import HTTPStatus
+import asyncio
+import json
+import math
+import time
+
+REQUEST_HELP = "Latency of an HTTP request to the recommendation service."
+BATCH_HELP = "Number of requests scored together in one micro-batch."
+
+
+class BadRequest(ValueError):
+    pass
+
+
+def to_records(recommendations):
+    """
+    Returns:
+        list: The rows of a course frame as JSON-serializable dicts, with
+        missing values as None.
+    """
+    frame = recommendations.astype(object).where(recommendations.notna(), None)
+    return frame.to_dict('records')
+
+
+class MicroBatcher:
+    """
+    Collects concurrent recommendation requests for up to `max_wait_ms` and
+    scores them as one batch on an executor thread, then resolves every
+    request's future with its own result. While a batch is being scored new
+    requests keep queueing, so batches grow with load.
+    """
+
+    def __init__(self, engine, config, executor):
+        self.engine = engine
+        self.config = config
+        self.executor = executor
+        self.queue = asyncio.Queue()
+
+    async def submit(self, user_id, top_n, weights):
+        """
+        Queues one request and waits for its recommendations.
+
+        Returns:
+            pd.DataFrame: Recommended courses.
+        """
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((user_id, top_n, weights, future))
+        return await future
+
+    async def collect(self):
+        """
+        Returns:
+            list: Requests received within the batching window of the first one.
+        """
+        loop = asyncio.get_running_loop()
+        batch = [await self.queue.get()]
+        deadline = loop.time() + self.config.max_wait_ms / 1000
+        while len(batch) < self.config.max_batch_size:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self.queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = await self.collect()
+            metrics.observe('service_batch_size', len(batch), BATCH_HELP)
+            groups = {}
+            for request in batch:
+                # A malformed request fails on its own instead of stopping the batcher
+                try:
+                    key = (request[1], weights_key(request[2]))
+                    hash(key)
+                except Exception as e:
+                    if not request[3].done():
+                        request[3].set_exception(e)
+                    continue
+                groups.setdefault(key, []).append(request)
+            for (top_n, _), requests in groups.items():
+                user_ids = [request[0] for request in requests]
+                try:
+                    results = await loop.run_in_executor(
+                        self.executor, self.engine.recommend_many, user_ids, top_n, requests[0][2]
+                    )
+                except Exception as e:
+                    logger.exception(f"Error scoring a batch of {len(user_ids)} requests: {e}")
+                    for request in requests:
+                        if not request[3].done():
+                            request[3].set_exception(e)
+                    continue
+                for request, recommendations in zip(requests, results):
+                    if not request[3].done():
+                        request[3].set_result(recommendations)
+
+
+class RecommendationService:
+    """
+    Minimal asyncio HTTP/1.1 API in front of the recommender engine.
+
+    Endpoints:
+        GET  /health                            Readiness and model version.
+        GET  /recommendations?user_id=&top_n=   Recommendations for one user.
+        POST /recommendations                   {"user_ids": [...], "top_n": n, "weights": {...}}
+        GET  /similar?course_id=&top_n=         Courses related to one course.
+        GET  /metrics                           Metrics in the Prometheus text format.
+    """
+
+    def __init__(self, engine=None, config=None):
+        self.engine = engine if engine is not None else get_engine()
+        self.config = config if config is not None else ServiceConfig()
+
+    def parse_top_n(self, value):
+        top_n = self.config.default_top_n if value is None else int(value)
+        if not 1 <= top_n <= self.config.max_top_n:
+            raise BadRequest(f"top_n must be between 1 and {self.config.max_top_n}")
+        return top_n
+
+    def parse_weights(self, weights):
+        """
+        Returns:
+            dict: The signal weights as floats, or None for the default weights.
+
+        Raises:
+            BadRequest: If weights is not an object of finite numbers keyed by signal name.
+        """
+        if weights is None:
+            return None
+        if not isinstance(weights, dict):
+            raise BadRequest("weights must be an object")
+        unknown = set(weights) - set(DEFAULT_WEIGHTS)
+        if unknown:
+            raise BadRequest(f"unknown weights {sorted(unknown)}; expected a subset of {sorted(DEFAULT_WEIGHTS)}")
+        for name, value in weights.items():
+            if isinstance(value, bool) or not isinstance(value, (int, float)) or not math.isfinite(value):
+                raise BadRequest(f"weight {name} must be a finite number")
+        return {name: float(value) for name, value in weights.items()}
+
+    async def recommendations(self, method, query, body):
+        if method == 'GET':
+            if 'user_id' not in query:
+                raise BadRequest("user_id is required")
+            user_id = int(query['user_id'][0])
+            top_n = self.parse_top_n(query.get('top_n', [None])[0])
+            recommendations = await self.batcher.submit(user_id, top_n, None)
+            return {
+                'user_id': user_id,
+                'model_version': self.engine.model_version,
+                'recommendations': to_records(recommendations),
+            }
+
+        payload = json.loads(body or b'{}')
+        user_ids = [int(user_id) for user_id in payload.get('user_ids', [])]
+        if not user_ids:
+            raise BadRequest("user_ids must be a non-empty list")
+        top_n = self.parse_top_n(payload.get('top_n'))
+        weights = self.parse_weights(payload.get('weights'))
+        results = await asyncio.gather(*(self.batcher.submit(user_id, top_n, weights) for user_id in user_ids))
+        return {
+            'model_version': self.engine.model_version,
+            'results': [
+                {'user_id': user_id, 'recommendations': to_records(recommendations)}
+                for user_id, recommendations in zip(user_ids, results)
+            ],
+        }
+
+    async def similar(self, query):
+        if 'course_id' not in query:
+            raise BadRequest("course_id is required")
+        course_id = int(query['course_id'][0])
+        top_n = self.parse_top_n(query.get('top_n', [None])[0])
+        # A reload or a catalog scan can take a while, so it runs off the event loop
+        similar = await asyncio.get_running_loop().run_in_executor(
+            self.batcher.executor, self.engine.similar_courses, course_id, top_n
+        )
+        return {'course_id': course_id, 'similar_courses': to_records(similar)}
+
+    async def dispatch(self, method, target, body):
+        """
+        Routes one request.
+
+        Returns:
+            tuple: HTTP status, content type and response body bytes.
+        """
+        url = urlsplit(target)
+        try:
+            if url.path == '/health' and method == 'GET':
+                payload = {'ready': self.engine.is_ready(), 'model_version': self.engine.model_version}
+            elif url.path == '/metrics' and method == 'GET':
+                return HTTPStatus.OK, 'text/plain; version=0.0.4', metrics.render_prometheus().encode('utf-8')
+            elif url.path == '/similar' and method == 'GET':
+                payload = await self.similar(parse_qs(url.query))
+            elif url.path == '/recommendations' and method in ('GET', 'POST'):
+                payload = await self.recommendations(method, parse_qs(url.query), body)
+            else:
+                return HTTPStatus.NOT_FOUND, 'application/json', b'{"error": "not found"}'
+            return HTTPStatus.OK, 'application/json', json.dumps(payload).encode('utf-8')
+        except (BadRequest, ValueError, TypeError) as e:
+            return HTTPStatus.BAD_REQUEST, 'application/json', json.dumps({'error': str(e)}).encode('utf-8')
+        except Exception as e:
+            logger.exception(f"Error handling {method} {target}: {e}")
+            return HTTPStatus.INTERNAL_SERVER_ERROR, 'application/json', b'{"error": "internal server error"}'
+
+    async def handle_connection(self, reader, writer):
+        """
+        Serves requests on one connection until the client closes it or asks
+        for `Connection: close`.
+        """
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, target, version = request_line.decode('latin-1').split()
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+
+                start = time.perf_counter()
+                length = int(headers.get('content-length', 0))
+                if length > self.config.max_body_bytes:
+                    status, content_type, body = HTTPStatus.REQUEST_ENTITY_TOO_LARGE, 'application/json', b'{"error": "body too large"}'
+                else:
+                    body = await reader.readexactly(length) if length else b''
+                    status, content_type, body = await self.dispatch(method.upper(), target, body)
+                metrics.observe('service_request_seconds', time.perf_counter() - start, REQUEST_HELP,
+                                path=urlsplit(target).path, status=int(status))
+
+                keep_alive = headers.get('connection', '').lower() != 'close' and version == 'HTTP/1.1'
+                writer.write(
+                    f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+                    f"Content-Type: {content_type}\r\n"
+                    f"Content-Length: {len(body)}\r\n"
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode('latin-1') + body
+                )
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self):
+        """
+        Loads the engine, starts the micro-batcher and serves until cancelled.
+        """
+        loop = asyncio.get_running_loop()
+        with ThreadPoolExecutor(max_workers=self.config.executor_workers) as executor:
+            # Load and warm up off the event loop
+            await loop.run_in_executor(executor, self.engine.warm_up)
+            self.batcher = MicroBatcher(self.engine, self.config, executor)
+            batcher_task = asyncio.create_task(self.batcher.run())
+            server = await asyncio.start_server(self.handle_connection, self.config.host, self.config.port)
+            logger.info(f"Recommendation service listening on {self.config.host}:{self.config.port}")
+            try:
+                async with server:
+                    await server.serve_forever()
+            finally:
+                batcher_task.cancel()
+
+    def run(self):
+        """
+        Runs the service in a new event loop until interrupted.
+        """
+        configure_logging()
+        try:
+            asyncio.run(self.serve())
+        except KeyboardInterrupt:
+            logger.info("Recommendation service stopped.")
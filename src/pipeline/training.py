@@ -1,33 +1,121 @@
 from src.components.data_ingestion import DataIngestion
 from src.components.data_validation import DataValidation
 from src.components.data_transformation import DataTransformation
+from src.components.model_trainer import ModelTrainer
+from src.components.top_n_table import TopNMaterialization
+from src.components.manifest import Manifest
+from src.config.manifest import TRAINING_STAGES
 from src.logger import logger
 from src.exception import CustomException
+from src.metrics import metrics
 import sys
 
+STAGE_HELP = "Duration of a training pipeline stage."
+SKIP_HELP = "Training stages skipped because their inputs were unchanged."
+
+
 class Train:
-    def initiate_training(self):
+    STAGES = TRAINING_STAGES
+
+    def __init__(self, manifest=None):
+        self.manifest = manifest if manifest is not None else Manifest()
+
+    def run_stage(self, stage, run, inputs, outputs, config, force=False):
         """
-        Orchestrates the end-to-end training process, including data ingestion, validation, and transformation.
+        Runs a stage unless its inputs and configuration match the fingerprint
+        recorded in the manifest by its last successful run.
+
+        Args:
+            stage (str): Stage name.
+            run (Callable): Runs the stage.
+            inputs (list): Input file paths.
+            outputs (list): Output paths that must exist for a skip.
+            config (dict): Configuration the stage output depends on.
+            force (bool): Run even when the fingerprint is unchanged.
+
+        Returns:
+            bool: True if the stage ran.
+        """
+        fingerprint = self.manifest.fingerprint(inputs, config)
+        if not force and self.manifest.is_current(stage, fingerprint, outputs):
+            logger.info(f"Skipping {stage}: inputs and configuration unchanged.")
+            metrics.increment('training_stage_skips_total', 1, SKIP_HELP, stage=stage)
+            return False
+        logger.info(f"Starting {stage} process.")
+        with metrics.span('training_stage_seconds', STAGE_HELP, stage=stage):
+            run()
+        self.manifest.record(stage, fingerprint)
+        logger.info(f"{stage.capitalize()} completed successfully.")
+        return True
+
+    def initiate_training(self, incremental=False, full_refresh=False, force_stages=()):
+        """
+        Orchestrates the end-to-end training process, including data ingestion, validation, transformation,
+        model training and materialization of every user's top-N recommendations. Stages after ingestion
+        are skipped when their inputs and configuration are unchanged since their last run.
+
+        Args:
+            incremental (bool): Only re-vectorize new or edited courses and fold new ratings into the
+                existing factor model instead of rebuilding both from scratch.
+            full_refresh (bool): Re-download every MongoDB collection instead of only the
+                documents added since the last ingestion.
+            force_stages (Iterable[str]): Stages to run even when unchanged; 'all' forces every stage.
         """
         try:
-            # Data Ingestion
+            force_stages = set(self.STAGES) if 'all' in force_stages else set(force_stages)
+
+            # Data Ingestion: always runs, it only fetches documents past the stored watermarks
             logger.info("Starting data ingestion process.")
-            ingestor = DataIngestion()
-            ingestor.initiate_data_ingestion()
+            ingestor = DataIngestion(full_refresh=full_refresh)
+            with metrics.span('training_stage_seconds', STAGE_HELP, stage='ingestion'):
+                ingestor.initiate_data_ingestion()
             logger.info("Data ingestion completed successfully.")
 
             # Data Validation
-            logger.info("Starting data validation process.")
             validator = DataValidation()
-            validator.initiate_data_validation()
-            logger.info("Data validation completed successfully.")
+            self.run_stage(
+                'validation', validator.initiate_data_validation,
+                inputs=[validator.input.course_filepath],
+                outputs=[validator.artifact.report_filepath],
+                config={'artifact': validator.artifact},
+                force='validation' in force_stages
+            )
 
             # Data Transformation
-            logger.info("Starting data transformation process.")
             transformer = DataTransformation()
-            transformer.initiate_data_transformation()
-            logger.info("Data transformation completed successfully.")
+            self.run_stage(
+                'transformation', lambda: transformer.initiate_data_transformation(incremental=incremental),
+                inputs=[transformer.input.course_filepath],
+                outputs=[transformer.artifact.vector_filepath, transformer.artifact.vectorizer_filepath,
+                         transformer.artifact.ann_index_filepath, transformer.artifact.similarity_graph_filepath,
+                         transformer.artifact.bundle_dirpath],
+                config={'artifact': transformer.artifact, 'bundle_columns': transformer.artifact.bundle_columns},
+                force='transformation' in force_stages
+            )
+
+            # Model Training
+            model_trainer = ModelTrainer()
+            self.run_stage(
+                'model_training', lambda: model_trainer.initiate_model_training(incremental=incremental),
+                inputs=[model_trainer.input.ratings_filepath],
+                outputs=[model_trainer.artifact.model_filepath, model_trainer.artifact.state_filepath],
+                config={'artifact': model_trainer.artifact},
+                force='model_training' in force_stages
+            )
+
+            # Top-N Materialization
+            materializer = TopNMaterialization()
+            self.run_stage(
+                'materialization', materializer.initiate_materialization,
+                inputs=[materializer.input.course_filepath, materializer.input.users_filepath,
+                        materializer.input.ratings_filepath, materializer.input.tf_idf_filepath,
+                        materializer.input.similarity_graph_filepath, materializer.input.svd_model_filepath],
+                outputs=[materializer.artifact.filepath, materializer.input.context_index_filepath],
+                config={'input': materializer.input, 'artifact': materializer.artifact},
+                force='materialization' in force_stages
+            )
+
+            self.record_artifact_sizes(ingestor, validator, transformer, model_trainer, materializer)
 
         except CustomException as ce:
             logger.error(f"Custom exception occurred during training: {ce}")
@@ -39,3 +127,22 @@ class Train:
 
         logger.info("Training process completed successfully.")
 
+    def record_artifact_sizes(self, ingestor, validator, transformer, model_trainer, materializer):
+        """
+        Exports the on-disk size of every artifact the pipeline wrote.
+        """
+        metrics.record_file_sizes({
+            'courses': ingestor.artifact.course_filepath,
+            'ratings': ingestor.artifact.ratings_filepath,
+            'users': ingestor.artifact.users_filepath,
+            'validation_report': validator.artifact.report_filepath,
+            'tf_idf': transformer.artifact.vector_filepath,
+            'vectorizer': transformer.artifact.vectorizer_filepath,
+            'ann_index': transformer.artifact.ann_index_filepath,
+            'similarity_graph': transformer.artifact.similarity_graph_filepath,
+            'bundle': transformer.artifact.bundle_dirpath,
+            'svd_model': model_trainer.artifact.model_filepath,
+            'top_n': materializer.artifact.filepath,
+            'context_index': materializer.input.context_index_filepath,
+        })
+
@@ -0,0 +1,48 @@
+import pickle
+import numpy as np
+import pytest
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+from src.components.data_transformation import DataTransformation
+from src.config.data_transformation import DataTransformationArtifact
+
+TEXTS = [
+    "Python for data science and machine learning",
+    "Learn machine learning with Python and scikit-learn",
+    "Data engineering pipelines with SQL and Python",
+    "Deep learning for computer vision",
+    "Statistics for data science, statistics for everyone",
+    "SQL for data analysis and reporting",
+    "Computer vision with deep neural networks",
+    "Web development with JavaScript and React",
+]
+QUERIES = ["python machine learning", "data analysis with sql", "an unseen course about rust"]
+
+
+@pytest.mark.parametrize('tfidf_params', [
+    {'stop_words': 'english', 'ngram_range': (1, 3), 'max_features': 5000},
+    {'use_idf': False},
+    {'sublinear_tf': True, 'norm': 'l1'},
+    {'binary': True, 'smooth_idf': False, 'norm': None},
+    {'min_df': 2, 'max_df': 0.5},
+    {'max_features': 10, 'ngram_range': (1, 2)},
+    {'dtype': np.float32},
+])
+def test_parallel_fit_matches_serial_fit(tfidf_params):
+    transformer = DataTransformation(artifact_config=DataTransformationArtifact(tfidf_params=tfidf_params))
+    parallel_vectorizer, parallel_matrix = transformer.get_vectors_parallel(TEXTS, n_jobs=3)
+    # The serial path of get_vectors
+    serial_vectorizer = TfidfVectorizer(**tfidf_params)
+    serial_matrix = serial_vectorizer.fit_transform(TEXTS)
+
+    assert parallel_vectorizer.vocabulary_ == serial_vectorizer.vocabulary_
+    assert parallel_matrix.dtype == serial_matrix.dtype
+    np.testing.assert_array_equal(parallel_matrix.toarray(), serial_matrix.toarray())
+    if serial_vectorizer.use_idf:
+        np.testing.assert_array_equal(parallel_vectorizer.idf_, serial_vectorizer.idf_)
+
+    # The fitted vectorizer must also transform new text, including after pickling
+    reloaded = pickle.loads(pickle.dumps(parallel_vectorizer))
+    expected = serial_vectorizer.transform(QUERIES).toarray()
+    np.testing.assert_array_equal(parallel_vectorizer.transform(QUERIES).toarray(), expected)
+    np.testing.assert_array_equal(reloaded.transform(QUERIES).toarray(), expected)
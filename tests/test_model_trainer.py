@@ -0,0 +1,74 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.components.model_trainer import ModelTrainer, load_model
+from src.config.model_trainer import ModelTrainerInput, ModelTrainerArtifact
+
+
+@pytest.fixture
+def trainer(tmp_path):
+    return ModelTrainer(
+        ModelTrainerInput(ratings_filepath=str(tmp_path / 'ratings.csv')),
+        ModelTrainerArtifact(
+            model_filepath=str(tmp_path / 'svd_model.npz'),
+            state_filepath=str(tmp_path / 'svd_state.npz'),
+            n_factors=3,
+            max_fold_in_fraction=0.5,
+        )
+    )
+
+
+def make_ratings(seed=0):
+    rng = np.random.default_rng(seed)
+    pairs = pd.MultiIndex.from_product([range(1, 11), range(1, 9)]).to_frame(index=False, name=['user_id', 'course_id'])
+    ratings = pairs.sample(50, random_state=seed).reset_index(drop=True)
+    return ratings.assign(rating=rng.integers(1, 6, len(ratings)))
+
+
+def train(trainer, ratings, incremental):
+    ratings.to_csv(trainer.input.ratings_filepath, index=False)
+    trainer.initiate_model_training(incremental=incremental)
+    return load_model(trainer.artifact.model_filepath)
+
+
+def test_reordered_ratings_keep_the_model(trainer):
+    ratings = make_ratings()
+    model = train(trainer, ratings, incremental=False)
+    reordered = train(trainer, ratings.sample(frac=1, random_state=1), incremental=True)
+    assert reordered['version'] == model['version']
+
+
+def test_edited_rating_folds_in_the_difference(trainer):
+    ratings = make_ratings()
+    model = train(trainer, ratings, incremental=False)
+
+    # The ingestion merge moves an edited rating to the end of the file
+    edited = ratings.iloc[[3]].assign(rating=ratings.loc[3, 'rating'] + 2)
+    updated = train(trainer, pd.concat([ratings.drop(index=3), edited], ignore_index=True), incremental=True)
+
+    assert int(updated['fold_ins']) == 1
+    assert int(updated['n_ratings']) == len(ratings)
+    user_row = np.searchsorted(model['user_ids'], edited['user_id'].iloc[0])
+    course_row = np.searchsorted(model['course_ids'], edited['course_id'].iloc[0])
+    expected = model['user_factors'].copy()
+    expected[user_row] += 2 * model['item_factors'][course_row]
+    np.testing.assert_allclose(updated['user_factors'], expected)
+
+
+def test_removed_and_new_ratings_are_folded_in(trainer):
+    ratings = make_ratings()
+    model = train(trainer, ratings, incremental=False)
+
+    removed = ratings.iloc[0]
+    added = pd.DataFrame({'user_id': [11], 'course_id': [1], 'rating': [4]})
+    updated = train(trainer, pd.concat([ratings.drop(index=0), added], ignore_index=True), incremental=True)
+
+    assert 11 in updated['user_ids']
+    expected = np.zeros((len(updated['user_ids']), model['user_factors'].shape[1]))
+    expected[np.searchsorted(updated['user_ids'], model['user_ids'])] = model['user_factors']
+    expected[np.searchsorted(updated['user_ids'], removed['user_id'])] -= (
+        removed['rating'] * model['item_factors'][np.searchsorted(model['course_ids'], removed['course_id'])]
+    )
+    expected[-1] = 4 * model['item_factors'][np.searchsorted(model['course_ids'], 1)]
+    np.testing.assert_allclose(updated['user_factors'], expected)
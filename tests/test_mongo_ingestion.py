@@ -0,0 +1,118 @@
+from datetime import datetime, timedelta
+import itertools
+import pandas as pd
+import pytest
+
+from src.pipeline import data_pusher
+from src.components.data_ingestion import DataIngestion
+
+mongomock = pytest.importorskip("mongomock")
+
+
+def make_frames():
+    """
+    Returns small course, ratings and user DataFrames shaped like the generated data.
+    """
+    course_df = pd.DataFrame({
+        'Title': [f'Course {i}' for i in range(1, 6)],
+        'Instructor': [f'Instructor {i}' for i in range(1, 6)],
+        'Keywords': ['python, data'] * 5,
+        'Learn': ['Learn things'] * 5,
+        'Description': ['A course'] * 5,
+        'course_id': list(range(1, 6)),
+    })
+    ratings_df = pd.DataFrame({
+        'user_id': [1, 1, 2, 2, 3, 3],
+        'course_id': [1, 2, 2, 3, 4, 5],
+        'rating': [5, 4, 3, 2, 1, 4],
+    })
+    user_df = pd.DataFrame({
+        'user_id': [1, 2, 3],
+        'role': ['Student', 'Engineer', 'Analyst'],
+        'goal': ['Learn', 'Upskill', 'Switch'],
+    })
+    return course_df, ratings_df, user_df
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setenv("MONGO_DB_NAME", "MOOC_DB")
+    # Strictly increasing write times, so a delta run never depends on the clock
+    start = datetime(2024, 1, 1)
+    times = (start + timedelta(seconds=i) for i in itertools.count())
+    monkeypatch.setattr(data_pusher, 'get_write_time', lambda: next(times))
+    return mongomock.MongoClient()
+
+
+@pytest.fixture
+def ingestion(client, tmp_path):
+    ingestion = DataIngestion(client=client)
+    ingestion.artifact.course_filepath = str(tmp_path / 'courses.csv')
+    ingestion.artifact.ratings_filepath = str(tmp_path / 'ratings.csv')
+    ingestion.artifact.users_filepath = str(tmp_path / 'users.csv')
+    ingestion.artifact.state_filepath = str(tmp_path / 'ingestion_state.yaml')
+    # Small chunks so that streaming and the chunked merge span several chunks
+    ingestion.artifact.chunk_size = 2
+    return ingestion
+
+
+def test_upsert_skips_unchanged_documents(client):
+    course_df, _, _ = make_frames()
+    collection = client['MOOC_DB']['Course_details']
+
+    assert data_pusher.upsert_collection(collection, course_df, ['course_id']) == 5
+    assert data_pusher.upsert_collection(collection, course_df, ['course_id']) == 0
+    assert any(index['key'] == [('updated_at', 1)] for index in collection.index_information().values())
+
+    course_df.loc[course_df['course_id'] == 2, 'Title'] = 'Course 2, revised'
+    assert data_pusher.upsert_collection(collection, course_df, ['course_id']) == 1
+    assert collection.count_documents({}) == 5
+    assert collection.find_one({'course_id': 2})['Title'] == 'Course 2, revised'
+
+
+def test_delta_ingestion_fetches_only_new_or_updated_documents(client, ingestion, monkeypatch):
+    course_df, ratings_df, user_df = make_frames()
+    data_pusher.push_to_mongodb(course_df, ratings_df, user_df, client=client)
+    ingestion.initiate_data_ingestion()
+    assert len(pd.read_csv(ingestion.artifact.course_filepath)) == 5
+
+    course_df.loc[course_df['course_id'] == 3, 'Title'] = 'Course 3, revised'
+    course_df.loc[len(course_df)] = ['Course 6', 'Instructor 6', 'sql', 'Learn SQL', 'A new course', 6]
+    data_pusher.push_to_mongodb(course_df, ratings_df, user_df, client=client)
+
+    fetched = {}
+    ingest_collection = ingestion.ingest_collection
+
+    def record_fetched(collection_name, file_name, watermark=None):
+        n_documents, watermark = ingest_collection(collection_name, file_name, watermark)
+        fetched[collection_name] = n_documents
+        return n_documents, watermark
+
+    monkeypatch.setattr(ingestion, 'ingest_collection', record_fetched)
+    ingestion.initiate_data_ingestion()
+
+    assert fetched == {'Course_details': 2, 'Ratings': 0, 'User_details': 0}
+    courses = pd.read_csv(ingestion.artifact.course_filepath).set_index('course_id')
+    assert len(courses) == 6
+    assert courses.loc[3, 'Title'] == 'Course 3, revised'
+    assert courses.loc[6, 'Title'] == 'Course 6'
+
+
+def test_merge_delta_keeps_latest_version_of_each_document(client, ingestion):
+    course_df, ratings_df, user_df = make_frames()
+    data_pusher.push_to_mongodb(course_df, ratings_df, user_df, client=client)
+    ingestion.initiate_data_ingestion()
+
+    ratings_df.loc[(ratings_df['user_id'] == 2) & (ratings_df['course_id'] == 3), 'rating'] = 5
+    user_df.loc[user_df['user_id'] == 1, 'goal'] = 'Teach'
+    data_pusher.push_to_mongodb(course_df, ratings_df, user_df, client=client)
+    ingestion.initiate_data_ingestion()
+
+    ratings = pd.read_csv(ingestion.artifact.ratings_filepath)
+    assert len(ratings) == 6
+    assert not ratings.duplicated(subset=['user_id', 'course_id']).any()
+    assert ratings.set_index(['user_id', 'course_id']).loc[(2, 3), 'rating'] == 5
+
+    users = pd.read_csv(ingestion.artifact.users_filepath)
+    assert len(users) == 3
+    assert users.set_index('user_id').loc[1, 'goal'] == 'Teach'